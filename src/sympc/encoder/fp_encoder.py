@@ -83,12 +83,10 @@ class FixedPointEncoder:
         if self._precision == 0:
             return tensor
 
-        correction = (tensor < 0).long()
-        dividend = tensor // self._scale - correction
-        remainder = tensor % self._scale
-        remainder += (remainder == 0).long() * self._scale * correction
-
-        tensor = dividend.float() + remainder.float() / self._scale
+        # A double holds the values exactly up to 2**53, so below it the conversion
+        # is exact and the result is rounded at most twice (the division and the cast
+        # to float). Above 2**53 the conversion to double already rounds the value
+        tensor = (tensor.double() / self._scale).float()
         return tensor
 
     @property
@@ -44,12 +44,7 @@ class Linear(SMPCModule):
             An MPCTensor the layer specific operation applied on the input
         """
 
-        res = x @ self.weight.T
-
-        if self.bias is not None:
-            res = res + self.bias
-
-        return res
+        return x.linear(self.weight.T, self.bias)
 
     __call__ = forward
 
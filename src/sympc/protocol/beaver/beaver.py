@@ -16,16 +16,15 @@ from typing import Tuple
 
 # third party
 import torch
-import torchcsprng as csprng  # type: ignore
 
+from sympc.store import CryptoPrimitiveProvider
 from sympc.store import register_primitive_generator
 from sympc.store import register_primitive_store_add
 from sympc.store import register_primitive_store_get
 from sympc.tensor import MPCTensor
 from sympc.tensor import ShareTensor
 from sympc.utils import count_wraps
-
-ttp_generator = csprng.create_random_device_generator()
+from sympc.utils import get_type_from_ring
 
 """ Those functions should be executed by the Trusted Party """
 
@@ -35,6 +34,8 @@ def _get_triples(
     nr_parties: int,
     a_shape: Tuple[int],
     b_shape: Tuple[int],
+    nr_instances: int = 1,
+    ring_size: int = 2 ** 64,
     **kwargs: Dict[Any, Any]
 ) -> List[Tuple[Tuple[ShareTensor, ShareTensor, ShareTensor]]]:
     """Get triples.
@@ -47,6 +48,10 @@ def _get_triples(
         nr_parties (int): Number of parties
         a_shape (Tuple[int]): Shape of a from beaver triples protocol.
         b_shape (Tuple[int]): Shape of b part from beaver triples protocol.
+        nr_instances (int): Number of triples to generate. The random values for
+            all the instances are drawn at once.
+        ring_size (int): Ring size of the session, the triples are generated with
+            the tensor type of the ring. Defaults to 2**64.
         kwargs: Arbitrary keyword arguments for commands.
 
 
@@ -54,24 +59,13 @@ def _get_triples(
         List[List[3 x List[ShareTensor, ShareTensor, ShareTensor]]]:
         The generated triples a,b,c for each party.
     """
-    a_rand = torch.empty(size=a_shape, dtype=torch.long).random_(
-        generator=ttp_generator
-    )
-    a_shares = MPCTensor.generate_shares(
-        secret=a_rand,
-        nr_parties=nr_parties,
-        tensor_type=torch.long,
-        encoder_precision=0,
-    )
+    tensor_type = get_type_from_ring(ring_size)
 
-    b_rand = torch.empty(size=b_shape, dtype=torch.long).random_(
-        generator=ttp_generator
+    a_rand_all = CryptoPrimitiveProvider.random_tensor(
+        (nr_instances, *a_shape), dtype=tensor_type
     )
-    b_shares = MPCTensor.generate_shares(
-        secret=b_rand,
-        nr_parties=nr_parties,
-        tensor_type=torch.long,
-        encoder_precision=0,
+    b_rand_all = CryptoPrimitiveProvider.random_tensor(
+        (nr_instances, *b_shape), dtype=tensor_type
     )
 
     if op_str == "conv2d":
@@ -79,13 +73,33 @@ def _get_triples(
     else:
         cmd = getattr(operator, op_str)
 
-    c_val = cmd(a_rand, b_rand, **kwargs)
-    c_shares = MPCTensor.generate_shares(
-        secret=c_val, nr_parties=nr_parties, tensor_type=torch.long, encoder_precision=0
-    )
-
-    # We are always creating an instance
-    triple_sequential = [(a_shares, b_shares, c_shares)]
+    triple_sequential = []
+    for a_rand, b_rand in zip(a_rand_all, b_rand_all):
+        a_shares = MPCTensor.generate_shares(
+            secret=a_rand,
+            nr_parties=nr_parties,
+            tensor_type=tensor_type,
+            encoder_precision=0,
+            ring_size=ring_size,
+        )
+        b_shares = MPCTensor.generate_shares(
+            secret=b_rand,
+            nr_parties=nr_parties,
+            tensor_type=tensor_type,
+            encoder_precision=0,
+            ring_size=ring_size,
+        )
+
+        c_val = cmd(a_rand, b_rand, **kwargs)
+        c_shares = MPCTensor.generate_shares(
+            secret=c_val,
+            nr_parties=nr_parties,
+            tensor_type=tensor_type,
+            encoder_precision=0,
+            ring_size=ring_size,
+        )
+
+        triple_sequential.append((a_shares, b_shares, c_shares))
 
     """
     Example -- for n_instances=2 and n_parties=2:
@@ -350,7 +364,7 @@ def conv2d_store_get(
 
 @register_primitive_generator("beaver_wraps")
 def count_wraps_rand(
-    nr_parties: int, shape: Tuple[int]
+    nr_parties: int, shape: Tuple[int], nr_instances: int = 1
 ) -> Tuple[List[ShareTensor], List[ShareTensor]]:
     """Count wraps random.
 
@@ -365,30 +379,34 @@ def count_wraps_rand(
     Args:
         nr_parties (int): Number of parties
         shape (Tuple[int]): The shape for the random value
+        nr_instances (int): Number of instances to generate. The random values for
+            all the instances are drawn at once.
 
     Returns:
         List[List[List[ShareTensor, ShareTensor]]: a list of instaces with the shares
         for a random integer value and shares for the number of wraparounds that are done when
         reconstructing the random value
     """
-    rand_val = torch.empty(size=shape, dtype=torch.long).random_(
-        generator=ttp_generator
-    )
-
-    r_shares = MPCTensor.generate_shares(
-        secret=rand_val,
-        nr_parties=nr_parties,
-        tensor_type=torch.long,
-        encoder_precision=0,
-    )
-    wraps = count_wraps([share.data for share in r_shares])
-
-    theta_r_shares = MPCTensor.generate_shares(
-        secret=wraps, nr_parties=nr_parties, tensor_type=torch.long, encoder_precision=0
-    )
-
-    # We are always creating only an instance
-    primitives_sequential = [(r_shares, theta_r_shares)]
+    rand_vals = CryptoPrimitiveProvider.random_tensor((nr_instances, *shape))
+
+    primitives_sequential = []
+    for rand_val in rand_vals:
+        r_shares = MPCTensor.generate_shares(
+            secret=rand_val,
+            nr_parties=nr_parties,
+            tensor_type=torch.long,
+            encoder_precision=0,
+        )
+        wraps = count_wraps([share.data for share in r_shares])
+
+        theta_r_shares = MPCTensor.generate_shares(
+            secret=wraps,
+            nr_parties=nr_parties,
+            tensor_type=torch.long,
+            encoder_precision=0,
+        )
+
+        primitives_sequential.append((r_shares, theta_r_shares))
 
     primitives = list(
         map(list, zip(*map(lambda x: map(list, zip(*x)), primitives_sequential)))
@@ -10,12 +10,12 @@ from typing import Dict
 from typing import Iterable
 from typing import List
 from typing import Tuple
+from typing import Union
 
 # third party
 import numpy as np
 import sycret
 import torch as th
-import torchcsprng as csprng  # type: ignore
 
 from sympc.protocol.protocol import Protocol
 from sympc.session import Session
@@ -27,8 +27,6 @@ from sympc.tensor import MPCTensor
 from sympc.tensor import ShareTensor
 from sympc.utils import parallel_execution
 
-ttp_generator = csprng.create_random_device_generator()
-
 λ = 127  # security parameter
 n = 32  # bit precision
 
@@ -40,7 +38,7 @@ dif = sycret.LeFactory(n_threads=N_CORES)
 
 # share level
 def mask_builder(
-    session: Session, x1: ShareTensor, x2: ShareTensor, op: str
+    session: Session, x1: ShareTensor, x2: Union[ShareTensor, th.Tensor], op: str
 ) -> ShareTensor:
     """Mask the private inputs.
 
@@ -52,7 +50,8 @@ def mask_builder(
     Args:
         session (Session): MPC Session.
         x1 (ShareTensor): Share of the first private value.
-        x2 (ShareTensor): Share of the second private value.
+        x2 (Union[ShareTensor, th.Tensor]): Share of the second private value or
+            a public value that all the parties use (0 when comparing with a public value).
         op (str): Type of operation to perform (eq or comp).
 
     Returns:
@@ -73,7 +72,9 @@ def mask_builder(
 
 
 # share level
-def evaluate(session: Session, b, x_masked, op, dtype="long") -> ShareTensor:
+def evaluate(
+    session: Session, b, x_masked, op, dtype="long", invert=False
+) -> ShareTensor:
     """Evaluate the FSS protocol on the masked and public input `x_masked`.
 
     Args:
@@ -82,6 +83,7 @@ def evaluate(session: Session, b, x_masked, op, dtype="long") -> ShareTensor:
         x_masked: the public input created by masking the private input
         op: the type of operation (eq or comp)
         dtype: the type of the shares (int or long)
+        invert: if True, return a share of 1 - result instead of the result
 
     Returns:
         ShareTensor: A share of the result of the FSS protocol.
@@ -102,6 +104,12 @@ def evaluate(session: Session, b, x_masked, op, dtype="long") -> ShareTensor:
 
     result_share = flat_result.astype(np.int32).astype(np.int64).reshape(original_shape)
 
+    if invert:
+        # 1 - result: every party negates its share and only party 0 adds 1
+        result_share = -result_share
+        if b == 0:
+            result_share += 1
+
     dtype_options = {None: th.long, "int": th.int32, "long": th.long}
     result = th.tensor(result_share, dtype=dtype_options[dtype])
 
@@ -110,28 +118,51 @@ def evaluate(session: Session, b, x_masked, op, dtype="long") -> ShareTensor:
     return share_result
 
 
-def fss_op(x1: MPCTensor, x2: MPCTensor, op="eq") -> MPCTensor:
+def fss_op(
+    x1: Union[MPCTensor, th.Tensor, float, int],
+    x2: Union[MPCTensor, th.Tensor, float, int],
+    op="eq",
+    invert=False,
+) -> MPCTensor:
     """Define the workflow for a binary operation using Function Secret Sharing.
 
     Currently supported operand are = & <=, respectively corresponding to
     op = 'eq' and 'comp'.
 
+    One of the values can be public, in which case x1 - x2 is compared with 0.
+
     Args:
-        x1 (MPCTensor): First private value.
-        x2 (MPCTensor): Second private value.
+        x1 (Union[MPCTensor, th.Tensor, float, int]): First value.
+        x2 (Union[MPCTensor, th.Tensor, float, int]): Second value.
         op: Type of operation to perform, should be 'eq' or 'comp'. Defaults to eq.
+        invert: Negate the result of the operation (for example to get 'ne' from
+            'eq') while evaluating it, such that no other operation is needed.
+            Defaults to False.
 
     Returns:
         MPCTensor: Shares of the comparison.
     """
     assert not th.cuda.is_available()  # nosec
 
-    # FIXME: Better handle the case where x1 or x2 is not a MPCTensor. For the moment
-    # FIXME: we cast it into a MPCTensor at the expense of extra communication
+    if isinstance(x1, MPCTensor) and isinstance(x2, MPCTensor):
+        x2_shares = x2.share_ptrs
+        # The shares are subtracted by the parties, so the operands might broadcast
+        shape = MPCTensor._get_shape("sub", x1.shape, x2.shape)
+    else:
+        # Compare x1 - x2 with 0: the public value is added by only one party,
+        # such that it does not need to be secret shared and sent to all of them
+        mpc_shape = x1.shape if isinstance(x1, MPCTensor) else x2.shape
+        x1 = x1.sub(x2) if isinstance(x1, MPCTensor) else x2.rsub(x1)
+        shape = x1.shape
+
+        # Only the share of the first party got the shape of the public value - if
+        # it is broadcast, the other shares are broadcast by subtracting zeros
+        zero = th.tensor(0) if shape == mpc_shape else th.zeros(shape, dtype=th.long)
+        x2_shares = [zero] * len(x1.share_ptrs)
+
     session = x1.session
     dtype = session.tensor_type
 
-    shape = MPCTensor._get_shape("sub", x1.shape, x2.shape)
     n_values = shape.numel()
 
     CryptoPrimitiveProvider.generate_primitives(
@@ -141,7 +172,7 @@ def fss_op(x1: MPCTensor, x2: MPCTensor, op="eq") -> MPCTensor:
         p_kwargs={},
     )
 
-    args = zip(session.session_ptrs, x1.share_ptrs, x2.share_ptrs)
+    args = zip(session.session_ptrs, x1.share_ptrs, x2_shares)
     args = [list(el) + [op] for el in args]
 
     shares = parallel_execution(mask_builder, session.parties)(args)
@@ -155,7 +186,7 @@ def fss_op(x1: MPCTensor, x2: MPCTensor, op="eq") -> MPCTensor:
         (session.session_ptrs[i], th.IntTensor([i]), mask_value, op) for i in range(2)
     ]
 
-    shares = parallel_execution(evaluate, session.parties)(args)
+    shares = parallel_execution(evaluate, session.parties)(args, {"invert": invert})
 
     response = MPCTensor(session=session, shares=shares, shape=shape)
     response.shape = shape
@@ -166,25 +197,33 @@ class FSS(metaclass=Protocol):
     """Function Secret Sharing."""
 
     @staticmethod
-    def eq(x1: MPCTensor, x2: MPCTensor) -> MPCTensor:
+    def eq(
+        x1: Union[MPCTensor, th.Tensor, float, int],
+        x2: Union[MPCTensor, th.Tensor, float, int],
+        invert: bool = False,
+    ) -> MPCTensor:
         """Equal operator.
 
         Args:
-            x1 (MPCTensor): First private value.
-            x2 (MPCTensor): Second private value.
+            x1 (Union[MPCTensor, th.Tensor, float, int]): First value.
+            x2 (Union[MPCTensor, th.Tensor, float, int]): Second value.
+            invert (bool): Compute "not equal" instead. Defaults to False.
 
         Returns:
             MPCTensor: Shares of the equality.
         """
-        return fss_op(x1, x2, "eq")
+        return fss_op(x1, x2, "eq", invert=invert)
 
     @staticmethod
-    def le(x1: MPCTensor, x2: MPCTensor) -> MPCTensor:
+    def le(
+        x1: Union[MPCTensor, th.Tensor, float, int],
+        x2: Union[MPCTensor, th.Tensor, float, int],
+    ) -> MPCTensor:
         """Lower equal operator.
 
         Args:
-            x1 (MPCTensor): First private value.
-            x2 (MPCTensor): Second private value.
+            x1 (Union[MPCTensor, th.Tensor, float, int]): First value.
+            x2 (Union[MPCTensor, th.Tensor, float, int]): Second value.
 
         Returns:
             MPCTensor: Shares of the comparison.
@@ -11,6 +11,7 @@ import operator
 from typing import Any
 from typing import Dict
 from typing import List
+from typing import Optional
 from typing import Tuple
 from typing import Union
 
@@ -31,7 +32,11 @@ EXPECTED_OPS = {"mul", "matmul", "conv2d"}
 
 
 def mul_master(
-    x: MPCTensor, y: MPCTensor, op_str: str, kwargs_: Dict[Any, Any]
+    x: MPCTensor,
+    y: MPCTensor,
+    op_str: str,
+    kwargs_: Dict[Any, Any],
+    bias: Optional[MPCTensor] = None,
 ) -> MPCTensor:
     """Function that is executed by the orchestrator to multiply two secret values.
 
@@ -40,9 +45,12 @@ def mul_master(
         y (MPCTensor): Second value to multiply with.
         op_str (str): Operation string.
         kwargs_ (dict): TODO:Add docstring.
+        bias (Optional[MPCTensor]): Secret value added to the result by the parties
+            in the same step as the multiplication. Defaults to None.
 
     Raises:
-        ValueError: If op_str not in EXPECTED_OPS.
+        ValueError: If op_str not in EXPECTED_OPS or if a bias is given for more
+            than 2 parties.
 
     Returns:
         MPCTensor: Result of the multiplication.
@@ -52,6 +60,11 @@ def mul_master(
 
     session = x.session
 
+    if bias is not None and session.nr_parties != 2:
+        # The bias can be added only after the result is divided by the scale,
+        # which is done by the parties only for 2 parties
+        raise ValueError("A bias can be added to the result only for 2 parties")
+
     shape_x = tuple(x.shape)
     shape_y = tuple(y.shape)
 
@@ -62,6 +75,7 @@ def mul_master(
             "a_shape": shape_x,
             "b_shape": shape_y,
             "nr_parties": session.nr_parties,
+            "ring_size": session.ring_size,
             **kwargs_,
         },
         p_kwargs={"a_shape": shape_x, "b_shape": shape_y},
@@ -75,17 +89,21 @@ def mul_master(
     mask = parallel_execution(spdz_mask, session.parties)(args)
     eps_shares, delta_shares = zip(*mask)
 
-    eps = MPCTensor(shares=eps_shares, session=session)
-    delta = MPCTensor(shares=delta_shares, session=session)
-
-    eps_plaintext = eps.reconstruct(decode=False)
-    delta_plaintext = delta.reconstruct(decode=False)
+    # Open eps and delta in the same round - the shares of both are requested
+    # at once instead of waiting for eps to be reconstructed first
+    local_shares = MPCTensor.get_local_shares([*eps_shares, *delta_shares])
+    nr_parties = len(eps_shares)
+    eps_plaintext = sum(share.tensor for share in local_shares[:nr_parties])
+    delta_plaintext = sum(share.tensor for share in local_shares[nr_parties:])
 
     # Arguments that must be sent to all parties
     common_args = [eps_plaintext, delta_plaintext, op_str]
 
     # Specific arguments to each party
     args = [[el] + common_args for el in session.session_ptrs]
+    if bias is not None:
+        for party_args, bias_share in zip(args, bias.share_ptrs):
+            party_args.append(bias_share)
 
     shares = parallel_execution(mul_parties, session.parties)(args, kwargs_)
 
@@ -111,11 +129,8 @@ def public_divide(x: MPCTensor, y: Union[torch.Tensor, int]) -> MPCTensor:
         shares = [operator.truediv(share, y) for share in x.share_ptrs]
         return MPCTensor(shares=shares, session=session, shape=res_shape)
 
-    primitives = CryptoPrimitiveProvider.generate_primitives(
-        "beaver_wraps",
-        sessions=session.session_ptrs,
-        g_kwargs={"nr_parties": session.nr_parties, "shape": res_shape},
-        p_kwargs=None,
+    primitives = CryptoPrimitiveProvider.generate_primitives_offline(
+        "beaver_wraps", nr_parties=session.nr_parties, shape=res_shape
     )
 
     r_sh, theta_r_sh = list(zip(*list(zip(*primitives))[0]))
@@ -211,7 +226,12 @@ def spdz_mask(
 
 
 def mul_parties(
-    session: Session, eps: torch.Tensor, delta: torch.Tensor, op_str: str, **kwargs
+    session: Session,
+    eps: torch.Tensor,
+    delta: torch.Tensor,
+    op_str: str,
+    bias_share: Optional[ShareTensor] = None,
+    **kwargs,
 ) -> ShareTensor:
     """SPDZ Multiplication.
 
@@ -220,6 +240,8 @@ def mul_parties(
         eps (torch:tensor): Epsilon value of the protocol.
         delta (torch.Tensor): Delta value of the protocol.
         op_str (str): Operator string.
+        bias_share (Optional[ShareTensor]): Share added to the (rescaled) result.
+            Defaults to None.
         kwargs: Keywords arguments for the operator.
 
     Returns:
@@ -251,14 +273,15 @@ def mul_parties(
     # Convert to our tensor type
     share_tensor = share_tensor.type(session.tensor_type)
 
-    share = ShareTensor(session=session)
-    share.tensor = share_tensor
-
     # Ideally this should stay in the MPCTensor
     # Step 1. Do spdz_mul
     # Step 2. Divide by scale
     # This is done here to reduce one round of communication
     if session.nr_parties == 2:
-        share.tensor //= share.fp_encoder.scale
+        share_tensor //= session.encoder_scale
+
+    if bias_share is not None:
+        share_tensor = share_tensor + bias_share.tensor
 
+    share = ShareTensor.from_tensor(share_tensor, session)
     return share
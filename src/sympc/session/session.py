@@ -55,10 +55,19 @@ class Session:
         max_value (int): the maximum value allowed for tensors' values
         tensor_type (Union[torch.dtype): tensor type used in the computation, this is used
             such that we get the "modulo" operation for free
+        encoder_scale (int): the scale of the Fixed Point Encoder (computed from config)
     """
 
     # Those values are not used at comparison
-    NOT_COMPARE = {"id", "description", "tags", "parties", "crypto_store"}
+    NOT_COMPARE = {
+        "id",
+        "description",
+        "tags",
+        "parties",
+        "crypto_store",
+        "encoder_scale",
+        "__weakref__",
+    }
 
     __slots__ = {
         # Populated in Syft
@@ -79,6 +88,9 @@ class Session:
         "min_value",
         "max_value",
         "tensor_type",
+        "encoder_scale",
+        # Sessions are kept in weak maps (ex: PARTIES_TO_SESSION)
+        "__weakref__",
     }
 
     def __init__(
@@ -136,6 +148,9 @@ class Session:
 
         self.config = config if config else Config()
 
+        # Recomputed in setup_mpc in case the config is changed after this
+        self.encoder_scale = self.config.encoder_base ** self.config.encoder_precision
+
         self.przs_generators: List[List[torch.Generator]] = []
 
         # Those will be populated in the setup_mpc
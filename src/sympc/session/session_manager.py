@@ -50,6 +50,9 @@ class SessionManager:
         Args:
             session (Session): Session to send.
         """
+        config = session.config
+        session.encoder_scale = config.encoder_base ** config.encoder_precision
+
         for rank, party in enumerate(session.parties):
             # Assign a new rank before sending it to another party
             session.rank = rank
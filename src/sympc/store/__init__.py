@@ -1,5 +1,8 @@
 """Package where needed crypto material is stored."""
 
+# stdlib
+import sys
+
 from sympc.store.crypto_primitive_provider import CryptoPrimitiveProvider
 from sympc.store.crypto_store import CryptoStore
 
@@ -16,7 +19,9 @@ def register_primitive_generator(name: str):
     def register_generator(func_generator):
         if name in CryptoPrimitiveProvider._func_providers:
             raise ValueError(f"Provider {name} already in _func_providers")
-        CryptoPrimitiveProvider._func_providers[name] = func_generator
+        # Interned keys let lookups with literal op names match by identity
+        CryptoPrimitiveProvider._func_providers[sys.intern(name)] = func_generator
+        CryptoPrimitiveProvider._state_cache = None
         return func_generator
 
     return register_generator
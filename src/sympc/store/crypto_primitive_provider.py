@@ -1,23 +1,249 @@
 """Crypto Primitives."""
 
 # stdlib
+from collections import OrderedDict
+from itertools import repeat
 import json
+import pickle  # nosec
+import queue
+import sys
+import threading
+from types import MappingProxyType
 from typing import Any
 from typing import Callable
-from typing import DefaultDict
 from typing import Dict
 from typing import List
+from typing import Mapping
+from typing import Optional
+from typing import TextIO
+from typing import Tuple
+from typing import Union
+from weakref import WeakKeyDictionary
+
+# third party
+import torch
+import torchcsprng as csprng  # type: ignore
+
+try:
+    # third party
+    import orjson
+except ImportError:
+    orjson = None
 
 from sympc.session import Session
+from sympc.utils import parallel_execution
+
+
+def _dumps(obj: Any) -> str:
+    """Serialize the logged ops to json, using orjson if it is installed.
+
+    Args:
+        obj (Any): Object to serialize.
+
+    Returns:
+        str: The json representation.
+    """
+    if orjson is None:
+        return json.dumps(obj)
+
+    # Shapes might be a torch.Size - orjson does not serialize tuple subclasses
+    return orjson.dumps(obj, default=list).decode()
+
+
+def _skip_logging(op_str: str, p_kwargs: Dict[str, Any]) -> None:
+    """Primitive logger used while logging is turned off."""
+
+
+class _OpLog:
+    """The populate kwargs logged for an op, stored column-wise.
+
+    The ops are (almost) always logged with the same kwargs keys, so we keep one
+    list of values per key instead of a dict per logged op. If an op is logged
+    with different keys we fall back to keeping the kwargs as they are.
+
+    Attributes:
+        keys (Optional[Tuple[str, ...]]): the kwargs keys shared by all the rows
+        columns (Optional[Tuple[List[Any], ...]]): the logged values for each key
+        nr_rows (int): the number of rows stored column-wise
+        rows (Optional[List[Any]]): the logged kwargs if they do not share the keys
+    """
+
+    __slots__ = ("keys", "columns", "nr_rows", "rows")
+
+    def __init__(self) -> None:
+        """Initializer for the op log."""
+        self.keys: Optional[Tuple[str, ...]] = None
+        self.columns: Optional[Tuple[List[Any], ...]] = None
+        self.nr_rows = 0
+        self.rows: Optional[List[Any]] = None
+
+    def append(self, p_kwargs: Optional[Dict[str, Any]]) -> None:
+        """Log the populate kwargs for a generated primitive.
+
+        Args:
+            p_kwargs (Optional[Dict[str, Any]]): Populate kwargs.
+        """
+        if self.rows is None:
+            keys = tuple(p_kwargs) if isinstance(p_kwargs, dict) else None
+
+            if self.nr_rows == 0 and keys is not None:
+                self.keys = keys
+                self.columns = tuple([] for _ in keys)
+
+            if keys is not None and keys == self.keys:
+                for column, value in zip(self.columns, p_kwargs.values()):
+                    column.append(value)
+                self.nr_rows += 1
+                return
+
+            self.rows = self.to_rows()
+
+        self.rows.append(p_kwargs)
+
+    def to_rows(self) -> List[Any]:
+        """Get the logged populate kwargs as a list of dicts.
+
+        Returns:
+            List[Any]: The logged kwargs in the order they were logged.
+        """
+        if self.rows is not None:
+            return self.rows
+
+        if self.nr_rows == 0:
+            return []
+
+        values = zip(*self.columns) if self.columns else repeat((), self.nr_rows)
+        return [dict(zip(self.keys, row)) for row in values]
+
+
+class _Prefetcher:
+    """Generate primitives in a daemon thread and keep them in a bounded queue.
+
+    The primitives do not depend on the values they are used with, only on the
+    generate kwargs, so they can be produced before they are requested (offline
+    phase). Each primitive is consumed only once.
+
+    If the generator raises, the producer stops and the exception is raised by
+    get instead of the next primitives.
+
+    Attributes:
+        queue (queue.Queue): the generated primitives (or the exception raised
+            by the generator), ready to be consumed
+        stop_event (threading.Event): set to stop the producer thread
+        thread (threading.Thread): the producer thread
+    """
+
+    __slots__ = ("queue", "stop_event", "thread")
+
+    def __init__(
+        self, generator: Callable, g_kwargs: Dict[str, Any], maxsize: int
+    ) -> None:
+        """Initializer for the prefetcher - starts the producer thread.
+
+        Args:
+            generator (Callable): The registered function for the primitives.
+            g_kwargs (Dict[str, Any]): Generate kwargs passed to the generator.
+            maxsize (int): Number of primitives kept ready in the queue.
+        """
+        self.queue: "queue.Queue[List[Any]]" = queue.Queue(maxsize=maxsize)
+        self.stop_event = threading.Event()
+        self.thread = threading.Thread(
+            target=self._produce, args=(generator, g_kwargs), daemon=True
+        )
+        self.thread.start()
+
+    def _produce(self, generator: Callable, g_kwargs: Dict[str, Any]) -> None:
+        """Fill the queue with primitives until the prefetcher is stopped.
+
+        Args:
+            generator (Callable): The registered function for the primitives.
+            g_kwargs (Dict[str, Any]): Generate kwargs passed to the generator.
+        """
+        while not self.stop_event.is_set():
+            try:
+                primitives = generator(**g_kwargs)
+            except Exception as e:
+                # Hand the error to the consumer - it would wait forever otherwise
+                self._put(e)
+                return
+
+            self._put(primitives)
+
+    def _put(self, item: Any) -> None:
+        """Put an item in the queue, waiting for a free slot unless stopped.
+
+        Args:
+            item (Any): The primitives or the exception raised by the generator.
+        """
+        while not self.stop_event.is_set():
+            try:
+                self.queue.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def get(self) -> List[Any]:
+        """Get the next generated primitives, waiting for them if needed.
+
+        Returns:
+            List[Any]: List of primitives.
+
+        Raises:
+            Exception: The exception raised by the generator in the producer thread.
+        """
+        primitives = self.queue.get()
+        if isinstance(primitives, Exception):
+            # Keep it in the queue, such that the next calls raise it as well
+            self.queue.put(primitives)
+            raise primitives
+
+        return primitives
+
+    def stop(self) -> None:
+        """Stop the producer thread and drop the primitives not consumed."""
+        self.stop_event.set()
+        self.thread.join()
+        with self.queue.mutex:
+            self.queue.queue.clear()
+
+
+# The registry and the op log are module globals such that the hot paths look
+# them up with a single global lookup - the class attributes are the same objects
+_FUNC_PROVIDERS: Mapping[str, Callable] = {}
+_OPS_LIST: Dict[str, _OpLog] = {}
+_PREFETCHERS: Dict[Tuple[str, str], _Prefetcher] = {}
 
 
 class CryptoPrimitiveProvider:
     """A trusted third party should use this class to generate crypto primitives."""
 
-    _func_providers: Dict[str, Callable] = {}
-    _ops_list: DefaultDict[str, List] = DefaultDict(list)
+    _func_providers: Mapping[str, Callable] = _FUNC_PROVIDERS
+    _ops_list: Dict[str, _OpLog] = _OPS_LIST
     _LOGGING = False
     _FILENAME = "primitive_log.json"
+    _STREAM_FILENAME = "primitive_log.jsonl"
+    _log_file: Optional[TextIO] = None
+
+    # The get_state result, reset when a provider is registered
+    _state_cache: Optional[str] = None
+
+    # Primitives generated with reuse=True, evicted in FIFO order
+    _reuse_cache: "OrderedDict[Tuple[str, str], List[Any]]" = OrderedDict()
+    _REUSE_CACHE_SIZE = 256
+
+    # Primitives generated in background threads, started with start_prefetch
+    _prefetchers: Dict[Tuple[str, str], _Prefetcher] = _PREFETCHERS
+    _PREFETCH_SIZE = 256
+
+    # Generator used by the TTP for the primitives randomness, created on first use
+    _ttp_generator: Optional[torch.Generator] = None
+
+    # The populate_store method for each session pointer we transferred to
+    _populate_store_fns: "WeakKeyDictionary[Any, Callable]" = WeakKeyDictionary()
+
+    # Swapped by start_logging/stop_logging such that generate_primitives
+    # does not need to check the _LOGGING flag for each primitive
+    _log_primitive: Callable[[str, Dict[str, Any]], None] = staticmethod(_skip_logging)
 
     def __init__(self) -> None:  # noqa
         raise ValueError("This class should not be initialized")
@@ -26,8 +252,10 @@ class CryptoPrimitiveProvider:
     def generate_primitives(
         op_str: str,
         sessions: List[Any],
-        g_kwargs: Dict[str, Any] = {},
-        p_kwargs: Dict[str, Any] = {},
+        g_kwargs: Optional[Dict[str, Any]] = None,
+        p_kwargs: Optional[Dict[str, Any]] = {},
+        n_ops: int = 1,
+        reuse: bool = False,
     ) -> List[Any]:
         """Generate "op_str" primitives.
 
@@ -35,7 +263,18 @@ class CryptoPrimitiveProvider:
             op_str (str): Operator.
             sessions (Session): Session.
             g_kwargs: Generate kwargs passed to the registered function.
+                Defaults to None (no kwargs).
             p_kwargs: Populate kwargs passed to the registered populate function.
+                If it is None the primitives are not transferred to the parties.
+            n_ops (int): Number of primitive instances to generate in one go. If it
+                is not 1 it is passed as "nr_instances" to the registered function,
+                which should support batch generation. Defaults to 1.
+            reuse (bool): If True, the primitives generated before for the same
+                op_str and g_kwargs are returned instead of generating new ones.
+                Reusing primitives is NOT secure for one-time values like the Beaver
+                triples or the FSS keys - it should only be used for randomness that
+                is allowed to be public or reused with independent inputs.
+                Defaults to False.
 
         Returns:
             List[Any]: List of primitives.
@@ -44,26 +283,191 @@ class CryptoPrimitiveProvider:
             ValueError: If op_str is not registered.
 
         """
-        if op_str not in CryptoPrimitiveProvider._func_providers:
+        cls = CryptoPrimitiveProvider
+
+        generator = _FUNC_PROVIDERS.get(op_str)
+        if generator is None:
             raise ValueError(f"{op_str} not registered")
 
-        generator = CryptoPrimitiveProvider._func_providers[op_str]
-        primitives = generator(**g_kwargs)
+        if n_ops != 1:
+            g_kwargs = {**(g_kwargs or {}), "nr_instances": n_ops}
 
-        if CryptoPrimitiveProvider._LOGGING:
-            CryptoPrimitiveProvider._ops_list[op_str].append(p_kwargs)
+        if reuse:
+            primitives = cls._get_reusable_primitives(op_str, generator, g_kwargs)
+        elif _PREFETCHERS:
+            primitives = cls._get_prefetched_primitives(op_str, generator, g_kwargs)
+        elif g_kwargs is None:
+            primitives = generator()
+        else:
+            primitives = generator(**g_kwargs)
+
+        cls._log_primitive(op_str, p_kwargs)
 
         if p_kwargs is not None:
             """Do not transfer the primitives if there is not specified a
             values for populate kwargs."""
-            CryptoPrimitiveProvider._transfer_primitives_to_parties(
-                op_str, primitives, sessions, p_kwargs
-            )
+            cls._transfer_primitives_to_parties(op_str, primitives, sessions, p_kwargs)
 
         # Since we do not have (YET!) the possiblity to return typed tuples from a remote
         # execute function we are using this
         return primitives
 
+    @staticmethod
+    def generate_primitives_offline(op_str: str, **g_kwargs: Any) -> List[Any]:
+        """Generate "op_str" primitives without transferring them to the parties.
+
+        Same as calling generate_primitives with p_kwargs=None, without the need
+        of passing the sessions.
+
+        Args:
+            op_str (str): Operator.
+            **g_kwargs: Generate kwargs passed to the registered function.
+
+        Returns:
+            List[Any]: List of primitives.
+
+        Raises:
+            ValueError: If op_str is not registered.
+        """
+        generator = _FUNC_PROVIDERS.get(op_str)
+        if generator is None:
+            raise ValueError(f"{op_str} not registered")
+
+        if _PREFETCHERS:
+            primitives = CryptoPrimitiveProvider._get_prefetched_primitives(
+                op_str, generator, g_kwargs
+            )
+        else:
+            primitives = generator(**g_kwargs)
+        CryptoPrimitiveProvider._log_primitive(op_str, None)
+        return primitives
+
+    @staticmethod
+    def _get_reusable_primitives(
+        op_str: str, generator: Callable, g_kwargs: Optional[Dict[str, Any]]
+    ) -> List[Any]:
+        """Get the primitives for op_str and g_kwargs from the reuse cache.
+
+        Args:
+            op_str (str): Operator.
+            generator (Callable): The registered function for op_str.
+            g_kwargs (Optional[Dict[str, Any]]): Generate kwargs.
+
+        Returns:
+            List[Any]: List of primitives.
+        """
+        g_kwargs = g_kwargs or {}
+        key = CryptoPrimitiveProvider._get_primitives_key(op_str, g_kwargs)
+        if key is None:
+            # The kwargs can not be used as a key - do not cache
+            return generator(**g_kwargs)
+
+        cache = CryptoPrimitiveProvider._reuse_cache
+        primitives = cache.get(key)
+        if primitives is None:
+            primitives = generator(**g_kwargs)
+            cache[key] = primitives
+            if len(cache) > CryptoPrimitiveProvider._REUSE_CACHE_SIZE:
+                cache.popitem(last=False)
+
+        return primitives
+
+    @staticmethod
+    def _get_primitives_key(
+        op_str: str, g_kwargs: Dict[str, Any]
+    ) -> Optional[Tuple[str, str]]:
+        """Get the key identifying the primitives generated for op_str and g_kwargs.
+
+        Args:
+            op_str (str): Operator.
+            g_kwargs (Dict[str, Any]): Generate kwargs.
+
+        Returns:
+            Optional[Tuple[str, str]]: The key or None if the kwargs are not
+            serializable.
+        """
+        try:
+            return (op_str, json.dumps(g_kwargs, sort_keys=True))
+        except TypeError:
+            return None
+
+    @staticmethod
+    def _get_prefetched_primitives(
+        op_str: str, generator: Callable, g_kwargs: Optional[Dict[str, Any]]
+    ) -> List[Any]:
+        """Get the primitives for op_str and g_kwargs from their prefetcher.
+
+        If there is no prefetcher started for them the primitives are generated now.
+
+        Args:
+            op_str (str): Operator.
+            generator (Callable): The registered function for op_str.
+            g_kwargs (Optional[Dict[str, Any]]): Generate kwargs.
+
+        Returns:
+            List[Any]: List of primitives.
+        """
+        g_kwargs = g_kwargs or {}
+        key = CryptoPrimitiveProvider._get_primitives_key(op_str, g_kwargs)
+        prefetcher = _PREFETCHERS.get(key)
+        if prefetcher is None:
+            return generator(**g_kwargs)
+
+        return prefetcher.get()
+
+    @staticmethod
+    def start_prefetch(
+        op_str: str, g_kwargs: Optional[Dict[str, Any]] = None, size: int = 0
+    ) -> None:
+        """Start generating "op_str" primitives in a background thread.
+
+        The primitives generated later for the same op_str and g_kwargs (with
+        generate_primitives or generate_primitives_offline) are taken from a bounded
+        queue filled by the thread, instead of being generated when they are needed.
+        Each prefetched primitive is used only once.
+
+        Args:
+            op_str (str): Operator.
+            g_kwargs (Optional[Dict[str, Any]]): Generate kwargs passed to the
+                registered function. They have to be exactly the ones used later for
+                generating the primitives (the same keys and values) - otherwise the
+                prefetched primitives are not used. For example mul_master generates
+                the "beaver_mul" primitives with "a_shape", "b_shape", "nr_parties"
+                and "ring_size" (the session ring size, even if it is the default).
+                Defaults to None (no kwargs).
+            size (int): Number of primitives kept ready. Defaults to 0, meaning
+                _PREFETCH_SIZE.
+
+        Raises:
+            ValueError: If op_str is not registered or if g_kwargs are not
+                serializable to json.
+        """
+        generator = _FUNC_PROVIDERS.get(op_str)
+        if generator is None:
+            raise ValueError(f"{op_str} not registered")
+
+        g_kwargs = g_kwargs or {}
+        key = CryptoPrimitiveProvider._get_primitives_key(op_str, g_kwargs)
+        if key is None:
+            raise ValueError(f"The generate kwargs for {op_str} can not be prefetched")
+
+        if key in _PREFETCHERS:
+            return
+
+        maxsize = size or CryptoPrimitiveProvider._PREFETCH_SIZE
+        _PREFETCHERS[key] = _Prefetcher(generator, g_kwargs, maxsize)
+
+    @staticmethod
+    def stop_prefetch() -> None:
+        """Stop all the background threads started with start_prefetch.
+
+        The prefetched primitives that were not used are dropped.
+        """
+        prefetchers = list(_PREFETCHERS.values())
+        _PREFETCHERS.clear()
+        for prefetcher in prefetchers:
+            prefetcher.stop()
+
     @staticmethod
     def _transfer_primitives_to_parties(
         op_str: str,
@@ -71,18 +475,93 @@ class CryptoPrimitiveProvider:
         sessions: List[Session],
         p_kwargs: Dict[str, Any],
     ) -> None:
-        if not isinstance(primitives, list):
-            raise ValueError("Primitives should be a List")
+        if __debug__:
+            # The generators are ours, so those checks are dropped with "python -O"
+            if not isinstance(primitives, list):
+                raise ValueError("Primitives should be a List")
 
-        if len(primitives) != len(sessions):
-            raise ValueError(
-                f"Primitives Len {len(primitives)} != Sessions Len {len(sessions)}"
-            )
+            if len(primitives) != len(sessions):
+                raise ValueError(
+                    f"Primitives Len {len(primitives)} != Sessions Len {len(sessions)}"
+                )
 
-        for primitives_party, session in zip(primitives, sessions):
-            session.crypto_store.populate_store(
-                op_str, primitives_party, **p_kwargs  # TODO
-            )
+        def _populate_store(populate_store: Callable, primitives_party: Any) -> None:
+            if p_kwargs:
+                populate_store(op_str, primitives_party, **p_kwargs)  # TODO
+            else:
+                populate_store(op_str, primitives_party)
+
+        get_populate_store = CryptoPrimitiveProvider._get_populate_store
+
+        # Each call is a round trip to a different party - send them concurrently
+        args = list(zip(map(get_populate_store, sessions), primitives))
+        parallel_execution(_populate_store)(args)
+
+    @staticmethod
+    def _get_populate_store(session: Session) -> Callable:
+        """Get the (cached) populate_store method of the session crypto store.
+
+        For a session pointer each attribute access is a request to the party,
+        so we resolve "session.crypto_store.populate_store" only once.
+
+        Args:
+            session (Session): Session (pointer).
+
+        Returns:
+            Callable: The populate_store method for the session.
+        """
+        populate_store_fns = CryptoPrimitiveProvider._populate_store_fns
+        try:
+            populate_store = populate_store_fns.get(session)
+        except TypeError:
+            # Not weak referenceable or hashable - do not cache it
+            return session.crypto_store.populate_store
+
+        if populate_store is None:
+            populate_store = session.crypto_store.populate_store
+            populate_store_fns[session] = populate_store
+
+        return populate_store
+
+    @staticmethod
+    def freeze() -> None:
+        """Make the registry of primitive providers read-only.
+
+        Should be called after all the providers are registered. Registering a
+        provider afterwards raises a TypeError.
+        """
+        global _FUNC_PROVIDERS
+
+        frozen = MappingProxyType(
+            {sys.intern(op_str): func for op_str, func in _FUNC_PROVIDERS.items()}
+        )
+        _FUNC_PROVIDERS = frozen
+        CryptoPrimitiveProvider._func_providers = frozen
+
+    @staticmethod
+    def random_tensor(
+        size: Tuple[int, ...], dtype: torch.dtype = torch.long
+    ) -> torch.Tensor:
+        """Get a tensor filled with random values to be used in the primitives.
+
+        All the registered generators draw from the same csprng random device
+        generator, which is created on first use instead of for each primitive.
+        The generator itself is not keyed once: each call takes a new key from the
+        system random device and expands it with csprng's own (software) AES.
+
+        Args:
+            size (Tuple[int, ...]): Size of the tensor.
+            dtype (torch.dtype): Type of the tensor. Defaults to torch.long.
+
+        Returns:
+            torch.Tensor: The random tensor.
+        """
+        generator = CryptoPrimitiveProvider._ttp_generator
+        if generator is None:
+            generator = csprng.create_random_device_generator()
+            CryptoPrimitiveProvider._ttp_generator = generator
+
+        return torch.empty(size=size, dtype=dtype).random_(generator=generator)
 
     @staticmethod
     def get_state() -> str:
@@ -91,30 +570,107 @@ class CryptoPrimitiveProvider:
         Returns:
             str: CryptoProvider
         """
-        res = f"Providers: {list(CryptoPrimitiveProvider._func_providers.keys())}\n"
+        res = CryptoPrimitiveProvider._state_cache
+        if res is None:
+            res = f"Providers: {list(_FUNC_PROVIDERS.keys())}\n"
+            CryptoPrimitiveProvider._state_cache = res
+
         return res
 
     @staticmethod
-    def start_logging() -> None:
-        """Sets the variable to True to start primitive logging."""
+    def start_logging(stream: bool = False) -> None:
+        """Sets the variable to True to start primitive logging.
+
+        Args:
+            stream (bool): when set to True each op is written to a separate
+                primitive_log.jsonl file (one json object per line) as soon as it is
+                generated, instead of being kept in memory until stop_logging
+        """
+        # Logging might be started again without being stopped
+        log_file = CryptoPrimitiveProvider._log_file
+        if log_file is not None:
+            log_file.close()
+            CryptoPrimitiveProvider._log_file = None
+
+        if stream:
+            log_file = open(
+                CryptoPrimitiveProvider._STREAM_FILENAME, "w", buffering=1 << 20
+            )
+            CryptoPrimitiveProvider._log_file = log_file
+
+            def _log_primitive(op_str: str, p_kwargs: Dict[str, Any]) -> None:
+                log_file.write(_dumps({"op_str": op_str, "p_kwargs": p_kwargs}))
+                log_file.write("\n")
+
+        else:
+
+            def _log_primitive(op_str: str, p_kwargs: Dict[str, Any]) -> None:
+                op_log = _OPS_LIST.get(op_str)
+                if op_log is None:
+                    op_log = _OPS_LIST[op_str] = _OpLog()
+                op_log.append(p_kwargs)
+
         CryptoPrimitiveProvider._LOGGING = True
+        CryptoPrimitiveProvider._log_primitive = staticmethod(_log_primitive)
 
     @staticmethod
-    def stop_logging(generate_file: bool = False):
+    def stop_logging(
+        generate_file: bool = False, fmt: Optional[str] = None
+    ) -> Union[str, bytes, Dict[str, List[Any]]]:
         """Sets the variable to False to stop primitive logging.
 
         Args:
             generate_file: when set to True generates a seperate primitive_log.json file
+            fmt (Optional[str]): format of the returned log - "json" (a json string),
+                "pickle" (a pickled dict) or "dict" (the dict itself). The "pickle" and
+                "dict" formats skip the json encoding and are meant for consumers in the
+                same Python process; cross-language consumers should use "json". If the
+                logging was started with stream=True the log is already written, so the
+                only format is "file" (the name of the written file). Defaults to None,
+                meaning "file" when streaming and "json" otherwise.
 
         Returns:
-            json: returns the json object containing ops details.
+            Union[str, bytes, Dict[str, List[Any]]]: returns the ops details in the
+            requested format.
+
+        Raises:
+            ValueError: If fmt is not a known format or if it is not "file" while
+                streaming, or if generate_file is set while streaming.
         """
+        log_file = CryptoPrimitiveProvider._log_file
+
+        if log_file is not None:
+            if fmt not in {None, "file"}:
+                raise ValueError(f"The streamed log can not be returned as {fmt}")
+
+            if generate_file:
+                raise ValueError("The streamed log is already written to a file")
+        elif fmt is None:
+            fmt = "json"
+        elif fmt not in {"json", "pickle", "dict"}:
+            raise ValueError(f"Unknown log format {fmt}")
+
         CryptoPrimitiveProvider._LOGGING = False
-        log_json = json.dumps(CryptoPrimitiveProvider._ops_list)
-        CryptoPrimitiveProvider._ops_list.clear()
+        CryptoPrimitiveProvider._log_primitive = staticmethod(_skip_logging)
+
+        if log_file is not None:
+            log_file.close()
+            CryptoPrimitiveProvider._log_file = None
+            return CryptoPrimitiveProvider._STREAM_FILENAME
+
+        ops = {op_str: log.to_rows() for op_str, log in _OPS_LIST.items()}
+        _OPS_LIST.clear()
+
+        log_json = _dumps(ops) if fmt == "json" or generate_file else None
 
         if generate_file:
             with open(CryptoPrimitiveProvider._FILENAME, "w") as f:
                 f.write(log_json)
 
+        if fmt == "dict":
+            return ops
+
+        if fmt == "pickle":
+            return pickle.dumps(ops, protocol=pickle.HIGHEST_PROTOCOL)
+
         return log_json
@@ -1,7 +1,10 @@
 """Class used to orchestrate the computation on shared values."""
 
 # stdlib
+from collections import OrderedDict
 from functools import lru_cache
+from functools import reduce
+from itertools import zip_longest
 import operator
 from typing import Any
 from typing import Callable
@@ -10,6 +13,7 @@ from typing import List
 from typing import Optional
 from typing import Tuple
 from typing import Union
+from weakref import WeakValueDictionary
 
 # third party
 from syft.core.node.common.client import Client
@@ -28,6 +32,310 @@ from .tensor import SyMPCTensor
 PROPERTIES_FORWARD_ALL_SHARES = {"T"}
 METHODS_FORWARD_ALL_SHARES = {}
 
+# Shortest addition chains for the small powers: each step multiplies two of the
+# previous powers (by index, the first one is x) - x ** 15 needs 5 multiplications
+# instead of the 6 done by square-and-multiply
+POW_ADDITION_CHAINS: Dict[int, List[Tuple[int, int]]] = {
+    2: [(0, 0)],
+    3: [(0, 0), (1, 0)],
+    4: [(0, 0), (1, 1)],
+    5: [(0, 0), (1, 1), (2, 0)],
+    6: [(0, 0), (1, 0), (2, 2)],
+    7: [(0, 0), (1, 0), (2, 1), (3, 1)],
+    8: [(0, 0), (1, 1), (2, 2)],
+    9: [(0, 0), (1, 1), (2, 2), (3, 0)],
+    10: [(0, 0), (1, 1), (2, 0), (3, 3)],
+    11: [(0, 0), (1, 0), (2, 1), (3, 3), (4, 0)],
+    12: [(0, 0), (1, 0), (2, 2), (3, 3)],
+    13: [(0, 0), (1, 0), (2, 1), (3, 3), (4, 2)],
+    14: [(0, 0), (1, 0), (2, 1), (3, 1), (4, 4)],
+    15: [(0, 0), (1, 0), (2, 2), (3, 3), (4, 2)],
+    16: [(0, 0), (1, 1), (2, 2), (3, 3)],
+}
+
+# Created only once - each new generator reads a new seed from the random device
+_shares_generator = csprng.create_random_device_generator()
+
+# Buffers used for drawing the random values in generate_shares, kept around
+# such that sharing tensors with the same shape does not allocate each time
+_RANDOM_BUF_POOL: "OrderedDict[Tuple[Tuple[int, ...], torch.dtype], List[torch.Tensor]]" = (
+    OrderedDict()
+)
+_RANDOM_BUF_POOL_KEYS = 32
+_RANDOM_BUF_POOL_SIZE = 4
+# Larger buffers are not kept - allocating them is cheap compared with filling them
+# and this bounds the memory held by the pool (keys x size x max bytes = 8 MiB)
+_RANDOM_BUF_MAX_BYTES = 1 << 16
+
+
+def _borrow_buffer(size: Tuple[int, ...], dtype: Optional[torch.dtype]) -> torch.Tensor:
+    """Get an uninitialized tensor from the buffer pool.
+
+    Args:
+        size (Tuple[int, ...]): The size of the tensor.
+        dtype (torch.dtype, optional): The type of the tensor.
+
+    Returns:
+        torch.Tensor: A tensor that is not used by anybody else.
+    """
+    if dtype is None:
+        dtype = torch.get_default_dtype()
+
+    buffers = _RANDOM_BUF_POOL.get((size, dtype))
+    if buffers:
+        try:
+            return buffers.pop()
+        except IndexError:
+            # Another thread took the last buffer
+            pass
+
+    return torch.empty(size=size, dtype=dtype)
+
+
+def _return_buffer(buffer: torch.Tensor) -> None:
+    """Put back a tensor in the buffer pool.
+
+    The tensor should not be used anymore by the caller.
+
+    Args:
+        buffer (torch.Tensor): The tensor taken with _borrow_buffer.
+    """
+    if buffer.numel() * buffer.element_size() > _RANDOM_BUF_MAX_BYTES:
+        return
+
+    key = (tuple(buffer.shape), buffer.dtype)
+    buffers = _RANDOM_BUF_POOL.get(key)
+    if buffers is None:
+        buffers = _RANDOM_BUF_POOL.setdefault(key, [])
+        if len(_RANDOM_BUF_POOL) > _RANDOM_BUF_POOL_KEYS:
+            try:
+                _RANDOM_BUF_POOL.popitem(last=False)
+            except KeyError:
+                pass
+
+    if len(buffers) < _RANDOM_BUF_POOL_SIZE:
+        buffers.append(buffer)
+
+
+@lru_cache(maxsize=None)
+def _fp_encoder(base: int, precision: int) -> FixedPointEncoder:
+    """Get the (shared) FixedPointEncoder for a base and precision.
+
+    The returned encoder should not be modified.
+
+    Args:
+        base (int): The base for the encoder.
+        precision (int): The precision for the encoder.
+
+    Returns:
+        FixedPointEncoder: The encoder.
+    """
+    return FixedPointEncoder(base=base, precision=precision)
+
+
+@lru_cache(maxsize=None)
+def _fp_one(base: int, precision: int) -> torch.Tensor:
+    """Get the smallest value that can be represented for a base and precision.
+
+    Args:
+        base (int): The base for the encoder.
+        precision (int): The precision for the encoder.
+
+    Returns:
+        torch.Tensor: The decoded value of 1.
+    """
+    return _fp_encoder(base, precision).decode(1)
+
+
+def _broadcast_shape(x_shape: Tuple[int, ...], y_shape: Tuple[int, ...]) -> torch.Size:
+    """Get the shape of the result when broadcasting two tensors.
+
+    Args:
+        x_shape (Tuple[int, ...]): Shape of the first tensor.
+        y_shape (Tuple[int, ...]): Shape of the second tensor.
+
+    Returns:
+        torch.Size: The broadcast shape.
+
+    Raises:
+        ValueError: If the shapes can not be broadcast together.
+    """
+    res = []
+    for x_dim, y_dim in zip_longest(reversed(x_shape), reversed(y_shape), fillvalue=1):
+        if x_dim == y_dim or y_dim == 1:
+            res.append(x_dim)
+        elif x_dim == 1:
+            res.append(y_dim)
+        else:
+            raise ValueError(f"Shapes {x_shape} and {y_shape} can not be broadcast")
+
+    return torch.Size(reversed(res))
+
+
+def _matmul_shape(x_shape: Tuple[int, ...], y_shape: Tuple[int, ...]) -> torch.Size:
+    """Get the shape of the result of a matmul (following the torch.matmul rules).
+
+    Args:
+        x_shape (Tuple[int, ...]): Shape of the first tensor.
+        y_shape (Tuple[int, ...]): Shape of the second tensor.
+
+    Returns:
+        torch.Size: The shape of the result.
+
+    Raises:
+        ValueError: If the shapes are not compatible.
+    """
+    if len(x_shape) == 0 or len(y_shape) == 0:
+        raise ValueError("Both arguments to matmul need to be at least 1D")
+
+    # 1D tensors are promoted to matrices and the added dimension is removed after
+    x_vector, y_vector = len(x_shape) == 1, len(y_shape) == 1
+    x_mat = (1, *x_shape) if x_vector else tuple(x_shape)
+    y_mat = (*y_shape, 1) if y_vector else tuple(y_shape)
+
+    if x_mat[-1] != y_mat[-2]:
+        raise ValueError(f"Shapes {x_shape} and {y_shape} can not be multiplied")
+
+    res = list(_broadcast_shape(x_mat[:-2], y_mat[:-2]))
+    if not x_vector:
+        res.append(x_mat[-2])
+    if not y_vector:
+        res.append(y_mat[-1])
+
+    return torch.Size(res)
+
+
+def _conv2d_shape(
+    x_shape: Tuple[int, ...],
+    y_shape: Tuple[int, ...],
+    stride: Union[int, Tuple[int, int]] = 1,
+    padding: Union[int, Tuple[int, int]] = 0,
+    dilation: Union[int, Tuple[int, int]] = 1,
+    groups: int = 1,
+) -> torch.Size:
+    """Get the shape of the result of a conv2d.
+
+    Args:
+        x_shape (Tuple[int, ...]): Shape of the input, (N, C, H, W).
+        y_shape (Tuple[int, ...]): Shape of the weight.
+        stride (Union[int, Tuple[int, int]]): Stride.
+        padding (Union[int, Tuple[int, int]]): Padding.
+        dilation (Union[int, Tuple[int, int]]): Dilation.
+        groups (int): Groups.
+
+    Returns:
+        torch.Size: The shape of the result.
+
+    Raises:
+        ValueError: If the shapes are not compatible.
+    """
+    # The same checks as torch (1.8) does for conv2d
+    if len(x_shape) != 4 or len(y_shape) != 4:
+        raise ValueError(f"Shapes {x_shape} and {y_shape} not supported by conv2d")
+
+    if groups <= 0 or y_shape[0] % groups != 0:
+        raise ValueError(f"The weight {y_shape} can not be split in {groups} groups")
+
+    if x_shape[1] != y_shape[1] * groups:
+        raise ValueError(f"Input {x_shape} does not match the weight {y_shape}")
+
+    out_size = []
+    for i, (in_dim, kernel_dim) in enumerate(zip(x_shape[-2:], y_shape[-2:])):
+        stride_i = stride if isinstance(stride, int) else stride[i]
+        padding_i = padding if isinstance(padding, int) else padding[i]
+        dilation_i = dilation if isinstance(dilation, int) else dilation[i]
+
+        dim = (in_dim + 2 * padding_i - dilation_i * (kernel_dim - 1) - 1) // stride_i
+        if dim < 0:
+            raise ValueError(f"Kernel {y_shape} is larger than the input {x_shape}")
+        out_size.append(dim + 1)
+
+    return torch.Size((x_shape[0], y_shape[0], *out_size))
+
+
+_SHAPE_INFERENCE: Dict[str, Callable[..., torch.Size]] = {
+    "add": _broadcast_shape,
+    "sub": _broadcast_shape,
+    "mul": _broadcast_shape,
+    "truediv": _broadcast_shape,
+    "matmul": _matmul_shape,
+    "conv2d": _conv2d_shape,
+}
+
+
+# op_str -> (operation applied on the shares, True if it is a multiplication
+# that needs the result to be divided by the encoder scale)
+_OPS: Dict[str, Tuple[Callable[[Any, Any], Any], bool]] = {
+    "add": (operator.add, False),
+    "sub": (operator.sub, False),
+    "mul": (operator.mul, True),
+    "matmul": (operator.matmul, True),
+    "conv2d": (torch.conv2d, True),
+}
+
+# A conv2d with a public weight is not supported
+_PUBLIC_OPS = {op_str: op for op_str, op in _OPS.items() if op_str != "conv2d"}
+
+
+def _unsqueeze_shape(shape: Tuple[int, ...], dim: int) -> torch.Size:
+    """Get the shape of a tensor after unsqueeze.
+
+    Args:
+        shape (Tuple[int, ...]): Shape of the tensor.
+        dim (int): The position where the dimension is inserted.
+
+    Returns:
+        torch.Size: The new shape.
+
+    Raises:
+        ValueError: If dim is out of range.
+    """
+    nr_dims = len(shape) + 1
+    if not -nr_dims <= dim < nr_dims:
+        raise ValueError(f"Dimension {dim} out of range for shape {shape}")
+
+    dim = dim % nr_dims
+    return torch.Size((*shape[:dim], 1, *shape[dim:]))
+
+
+def _view_shape(shape: Tuple[int, ...], *size: Any) -> torch.Size:
+    """Get the shape of a tensor after view.
+
+    Args:
+        shape (Tuple[int, ...]): Shape of the tensor.
+        *size (Any): The new size, given as ints or as a single sequence.
+
+    Returns:
+        torch.Size: The new shape.
+
+    Raises:
+        ValueError: If the new size is not compatible with the shape.
+    """
+    if len(size) == 1 and isinstance(size[0], (tuple, list, torch.Size)):
+        size = tuple(size[0])
+
+    nr_inferred = size.count(-1)
+    numel = reduce(operator.mul, shape, 1)
+
+    if nr_inferred == 1:
+        known = reduce(operator.mul, (dim for dim in size if dim != -1), 1)
+        if known == 0 or numel % known != 0:
+            raise ValueError(f"Shape {size} is invalid for a tensor of shape {shape}")
+        size = tuple(numel // known if dim == -1 else dim for dim in size)
+
+    if nr_inferred > 1 or reduce(operator.mul, size, 1) != numel:
+        raise ValueError(f"Shape {size} is invalid for a tensor of shape {shape}")
+
+    return torch.Size(size)
+
+
+# The shape of the result of the hooked properties and methods that change it
+_SHAPE_FNS: Dict[str, Callable[..., torch.Size]] = {
+    "T": lambda shape: torch.Size(reversed(shape)),
+    "unsqueeze": _unsqueeze_shape,
+    "view": _view_shape,
+}
+
 
 class MPCTensor(metaclass=SyMPCTensor):
     """Used by the orchestrator to compute on the shares.
@@ -115,6 +423,7 @@ class MPCTensor(metaclass=SyMPCTensor):
                 self.share_ptrs = MPCTensor.generate_przs(
                     shape=self.shape, session=self.session
                 )
+                self.shape = torch.Size(self.shape)
                 for i, share in enumerate(self.share_ptrs):
                     if share.client == secret.client:  # type: ignore
                         self.share_ptrs[i] = self.share_ptrs[i] + secret
@@ -133,6 +442,10 @@ class MPCTensor(metaclass=SyMPCTensor):
         if shape is not None:
             self.shape = shape
 
+        if self.shape is not None:
+            # Keep the shape hashable (and the same type) for the _get_shape cache
+            self.shape = torch.Size(self.shape)
+
         self.share_ptrs = shares
 
     @staticmethod
@@ -146,9 +459,12 @@ class MPCTensor(metaclass=SyMPCTensor):
         Returns:
             List of ShareTensorPointers.
         """
-        share_ptrs = []
-        for share, party in zip(shares, parties):
-            share_ptrs.append(share.send(party))
+
+        def _send(share: ShareTensor, party: Client) -> ShareTensor:
+            return share.send(party)
+
+        # Send the shares to all the parties concurrently
+        share_ptrs = parallel_execution(_send)(list(zip(shares, parties)))
 
         return share_ptrs
 
@@ -215,14 +531,16 @@ class MPCTensor(metaclass=SyMPCTensor):
         """
         shape = tuple(shape)
 
-        shares = []
-        for session_ptr, generators_ptr in zip(
-            session.session_ptrs, session.przs_generators
-        ):
-            share_ptr = session_ptr.przs_generate_random_share(
+        def _generate_przs(
+            session_ptr: Session, generators_ptr: List[torch.Generator]
+        ) -> ShareTensor:
+            return session_ptr.przs_generate_random_share(
                 shape=shape, generators=generators_ptr
             )
-            shares.append(share_ptr)
+
+        # All the parties generate their share in the same round
+        args = list(zip(session.session_ptrs, session.przs_generators))
+        shares = parallel_execution(_generate_przs)(args)
 
         return shares
 
@@ -275,48 +593,44 @@ class MPCTensor(metaclass=SyMPCTensor):
                 "Secret should be a ShareTensor, torchTensor, float or int."
             )
 
-        op = operator.sub
         shape = secret.shape
+        session = secret.session
 
-        random_shares = []
-        generator = csprng.create_random_device_generator()
+        # Draw the random values for all the parties at once
+        rand_values = _borrow_buffer((nr_parties - 1, *shape), tensor_type).random_(
+            generator=_shares_generator
+        )
 
-        for _ in range(nr_parties - 1):
-            rand_value = torch.empty(size=shape, dtype=tensor_type).random_(
-                generator=generator
-            )
-            share = ShareTensor(session=secret.session)
-            share.tensor = rand_value
+        # Each share gets its own storage - a view into rand_values would carry
+        # the random values of the other parties along when it is sent
+        tensors = [rand_values[0].clone()]
+        tensors.extend(
+            rand_values[i] - rand_values[i - 1] for i in range(1, nr_parties - 1)
+        )
+        tensors.append(secret.tensor - rand_values[-1])
 
-            random_shares.append(share)
+        # None of the shares is a view into rand_values, it can be reused
+        _return_buffer(rand_values)
 
-        shares = []
-        for i in range(nr_parties):
-            if i == 0:
-                share = random_shares[i]
-            elif i < nr_parties - 1:
-                share = op(random_shares[i], random_shares[i - 1])
-            else:
-                share = op(secret, random_shares[i - 1])
+        fp_encoder = secret.fp_encoder
+        shares = [
+            ShareTensor.from_tensor(tensor, session, fp_encoder) for tensor in tensors
+        ]
 
-            shares.append(share)
         return shares
 
-    def reconstruct(
-        self, decode: bool = True, get_shares: bool = False
-    ) -> Union[torch.Tensor, List[torch.Tensor]]:
-        """Reconstruct the secret.
+    @staticmethod
+    def get_local_shares(share_ptrs: List[ShareTensor]) -> List[ShareTensor]:
+        """Request and get the shares from the parties.
 
-        Request and get the shares from all the parties and reconstruct the
-        secret. Depending on the value of "decode", the secret would be decoded
-        or not using the FixedPrecision Encoder specific for the session.
+        All the shares are requested at once, the list can hold the shares of
+        more than one secret such that they are opened in the same round.
 
         Args:
-            decode (bool): True if decode using FixedPointEncoder. Defaults to True
-            get_shares (bool): True if get shares. Defaults to False.
+            share_ptrs (List[ShareTensor]): Pointers to the shares.
 
         Returns:
-            torch.Tensor. The secret reconstructed.
+            List[ShareTensor]: The local shares, in the same order as the pointers.
         """
 
         def _request_and_get(share_ptr: ShareTensor) -> ShareTensor:
@@ -334,25 +648,53 @@ class MPCTensor(metaclass=SyMPCTensor):
             res = share_ptr.get_copy()
             return res
 
-        request = _request_and_get
-        request_wrap = parallel_execution(request)
+        # The shares are not summed at one of the parties before being sent here
+        # (that would save bandwidth) because that party would learn the secret,
+        # only the orchestrator is allowed to see the reconstructed value
+        if all(
+            share_ptr.client.class_name == "VirtualMachineClient"
+            for share_ptr in share_ptrs
+        ):
+            # Virtual machines run in this process and answer right away, a thread
+            # pool would only add the cost of starting the threads. Domains are
+            # also "local" (no request needed) but each copy is a network round
+            # trip, so they are requested in parallel
+            return [share_ptr.get_copy() for share_ptr in share_ptrs]
 
-        args = [[share] for share in self.share_ptrs]
-        local_shares = request_wrap(args)
+        request_wrap = parallel_execution(_request_and_get)
+        args = [[share] for share in share_ptrs]
+        return request_wrap(args)
 
+    def reconstruct(
+        self, decode: bool = True, get_shares: bool = False
+    ) -> Union[torch.Tensor, List[torch.Tensor]]:
+        """Reconstruct the secret.
+
+        Request and get the shares from all the parties and reconstruct the
+        secret. Depending on the value of "decode", the secret would be decoded
+        or not using the FixedPrecision Encoder specific for the session.
+
+        Args:
+            decode (bool): True if decode using FixedPointEncoder. Defaults to True
+            get_shares (bool): True if get shares. Defaults to False.
+
+        Returns:
+            torch.Tensor. The secret reconstructed.
+        """
+        local_shares = MPCTensor.get_local_shares(self.share_ptrs)
         shares = [share.tensor for share in local_shares]
 
         if get_shares:
             return shares
 
-        plaintext = sum(shares)
+        # Accumulate in place - sum() would allocate a new tensor for each share
+        plaintext = shares[0].clone()
+        for share in shares[1:]:
+            plaintext.add_(share)
 
         if decode:
-            fp_encoder = FixedPointEncoder(
-                base=self.session.config.encoder_base,
-                precision=self.session.config.encoder_precision,
-            )
-
+            config = self.session.config
+            fp_encoder = _fp_encoder(config.encoder_base, config.encoder_precision)
             plaintext = fp_encoder.decode(plaintext)
 
         return plaintext
@@ -399,7 +741,12 @@ class MPCTensor(metaclass=SyMPCTensor):
         Returns:
             MPCTensor. Result of the operation.
         """
-        return self.__apply_op(y, "sub") * -1
+        # y - self = (-self) + y, negating the shares is a local operation that
+        # does not need any rescaling (-1 is not encoded)
+        neg_one = MPCTensor._get_integral_share(-1, self.session)
+        shares = [operator.mul(share, neg_one) for share in self.share_ptrs]
+        neg = MPCTensor(shares=shares, session=self.session, shape=self.shape)
+        return neg.__apply_op(y, "add")
 
     def mul(self, y: Union["MPCTensor", torch.Tensor, float, int]) -> "MPCTensor":
         """Apply the "mul" operation between "self" and "y".
@@ -423,6 +770,44 @@ class MPCTensor(metaclass=SyMPCTensor):
         """
         return self.__apply_op(y, "matmul")
 
+    def linear(
+        self,
+        weight: Union["MPCTensor", torch.Tensor, float, int],
+        bias: Optional[Union["MPCTensor", torch.Tensor, float, int]] = None,
+    ) -> "MPCTensor":
+        """Apply a linear transformation: self @ weight + bias.
+
+        When everything is private and there are 2 parties, the parties add the
+        bias while computing their share of the matmul, such that there is no
+        extra step for the addition.
+
+        Args:
+            weight (Union["MPCTensor", torch.Tensor, float, int]): The weight.
+            bias (Optional[Union["MPCTensor", torch.Tensor, float, int]]): Optional bias.
+
+        Returns:
+            MPCTensor. Result of the operation.
+        """
+        fuse_bias = (
+            isinstance(weight, MPCTensor)
+            and isinstance(bias, MPCTensor)
+            and self.session.nr_parties == 2
+            and self.session.uuid == weight.session.uuid == bias.session.uuid
+        )
+
+        if not fuse_bias:
+            result = self.matmul(weight)
+            if bias is not None:
+                result = result + bias
+            return result
+
+        from sympc.protocol.spdz import spdz
+
+        result = spdz.mul_master(self, weight, "matmul", {}, bias=bias)
+        matmul_shape = MPCTensor._get_shape("matmul", self.shape, weight.shape)
+        result.shape = MPCTensor._get_shape("add", matmul_shape, bias.shape)
+        return result
+
     def conv2d(
         self,
         weight: Union["MPCTensor", torch.Tensor, float, int],
@@ -471,8 +856,14 @@ class MPCTensor(metaclass=SyMPCTensor):
         Returns:
             MPCTensor. Result of the operation.
         """
-        op = getattr(operator, "matmul")
-        shares = [op(y, share) for share in self.share_ptrs]
+        y_integral = MPCTensor._get_integral_share(y, self.session)
+        if y_integral is not None:
+            # Same as for matmul - the integral value is not encoded, such that the
+            # result already has the right precision and there is no need for a division
+            shares = [share.__rmatmul__(y_integral) for share in self.share_ptrs]
+        else:
+            op = getattr(operator, "matmul")
+            shares = [op(y, share) for share in self.share_ptrs]
 
         if isinstance(y, (float, int)):
             y_shape = (1,)
@@ -482,10 +873,8 @@ class MPCTensor(metaclass=SyMPCTensor):
         result = MPCTensor(shares=shares, session=self.session)
         result.shape = MPCTensor._get_shape("matmul", y_shape, self.shape)
 
-        scale = (
-            self.session.config.encoder_base ** self.session.config.encoder_precision
-        )
-        result = result.div(scale)
+        if y_integral is None:
+            result = result.div(self.session.encoder_scale)
 
         return result
 
@@ -513,6 +902,8 @@ class MPCTensor(metaclass=SyMPCTensor):
     def pow(self, power: int) -> "MPCTensor":
         """Compute integer power of a number by recursion using mul.
 
+        For the small powers the multiplications from POW_ADDITION_CHAINS are used,
+        for the others:
         - Divide power by 2 and multiply base to itself (if the power is even)
         - Decrement power by 1 to make it even and then follow the first step
 
@@ -528,18 +919,34 @@ class MPCTensor(metaclass=SyMPCTensor):
         if power < 0:
             raise RuntimeError("Negative integer powers are not allowed.")
 
+        if power == 0:
+            # Both operations are local, 0 is not encoded and 1 is added by one party
+            return self * 0 + 1
+
+        if power == 1:
+            return self
+
+        chain = POW_ADDITION_CHAINS.get(power)
+        if chain is not None:
+            powers = [self]
+            for i, j in chain:
+                powers.append(powers[i] * powers[j])
+            return powers[-1]
+
         base = self
 
-        result = 1
+        # Start from the first factor instead of multiplying it with 1
+        result = None
         while power > 0:
             # If power is odd
             if power % 2 == 1:
-                result = result * base
+                result = base if result is None else result * base
 
             # Divide the power by 2
             power = power // 2
-            # Multiply base to itself
-            base = base * base
+            # Multiply base to itself, only if it is still needed
+            if power > 0:
+                base = base * base
 
         return result
 
@@ -564,16 +971,17 @@ class MPCTensor(metaclass=SyMPCTensor):
                 f"Need same session {self.session.uuid} and {y.session.uuid}"
             )
 
-        if op_str in {"mul", "matmul", "conv2d"}:
+        op, is_mul_op = _OPS[op_str]
+
+        if is_mul_op:
             from sympc.protocol.spdz import spdz
 
             result = spdz.mul_master(self, y, op_str, kwargs_)
             result.shape = MPCTensor._get_shape(op_str, self.shape, y.shape)
-        elif op_str in {"sub", "add"}:
-            op = getattr(operator, op_str)
-            shares = [
-                op(*share_tuple) for share_tuple in zip(self.share_ptrs, y.share_ptrs)
-            ]
+        else:
+            # Local at each party - dispatch the ops to all the parties at once
+            args = list(zip(self.share_ptrs, y.share_ptrs))
+            shares = parallel_execution(op)(args)
 
             result = MPCTensor(shares=shares, shape=self.shape, session=self.session)
 
@@ -595,17 +1003,18 @@ class MPCTensor(metaclass=SyMPCTensor):
         Raises:
             ValueError: If "op_str" is not supported.
         """
-        op = getattr(operator, op_str)
-        if op_str in {"mul", "matmul"}:
+        try:
+            op, is_mul_op = _PUBLIC_OPS[op_str]
+        except KeyError:
+            raise ValueError(f"{op_str} not supported")
+
+        if is_mul_op:
             shares = [op(share, y) for share in self.share_ptrs]
-        elif op_str in {"add", "sub"}:
-            shares = list(self.share_ptrs)
-            # Only the rank 0 party has to add the element
-            shares[0] = op(shares[0], y)
         else:
-            raise ValueError(f"{op_str} not supported")
+            # Only the rank 0 party has to add the element
+            shares = [op(self.share_ptrs[0], y), *self.share_ptrs[1:]]
 
-        result = MPCTensor(shares=shares, session=self.session)
+        result = MPCTensor(shares=shares, shape=self.shape, session=self.session)
         return result
 
     @staticmethod
@@ -619,6 +1028,13 @@ class MPCTensor(metaclass=SyMPCTensor):
                 f"Shapes should not be None; x_shape {x_shape}, y_shape {y_shape}"
             )
 
+        infer_shape = _SHAPE_INFERENCE.get(op_str)
+        if infer_shape is not None and all(
+            isinstance(arg, (int, tuple)) for arg in kwargs_.values()
+        ):
+            # Compute the shape without allocating (or computing on) any tensor
+            return infer_shape(x_shape, y_shape, **kwargs_)
+
         if op_str == "conv2d":
             op = torch.conv2d
         else:
@@ -630,6 +1046,39 @@ class MPCTensor(metaclass=SyMPCTensor):
         res = op(x, y, **kwargs_)
         return res.shape
 
+    @staticmethod
+    def _get_integral_share(
+        y: Union[torch.Tensor, float, int], session: Session
+    ) -> Optional[ShareTensor]:
+        """Wrap a public value that has only integer values in a ShareTensor.
+
+        The value is not encoded using the FixedPointEncoder.
+
+        Args:
+            y (Union[torch.Tensor, float, int]): Public value.
+            session (Session): Session.
+
+        Returns:
+            Optional[ShareTensor]: The share holding the value or None if "y" has values
+            that are not integers.
+        """
+        if isinstance(y, int) and not isinstance(y, bool):
+            tensor = torch.tensor(data=[y])
+        elif (
+            isinstance(y, torch.Tensor)
+            and y.dtype.is_floating_point
+            and torch.isfinite(y).all()
+            and torch.equal(y, y.trunc())
+        ):
+            tensor = y
+        elif isinstance(y, torch.Tensor) and not y.dtype.is_floating_point:
+            tensor = y
+        else:
+            return None
+
+        share = ShareTensor.from_tensor(tensor.type(session.tensor_type), session)
+        return share
+
     def __apply_op(
         self,
         y: Union["MPCTensor", torch.Tensor, float, int],
@@ -649,11 +1098,22 @@ class MPCTensor(metaclass=SyMPCTensor):
             MPCTensor. the operation "op_str" applied on "self" and "y"
         """
         is_private = isinstance(y, MPCTensor)
+        is_mul_op = _OPS[op_str][1]
+        rescale = is_mul_op
 
         if is_private:
             result = self.__apply_private_op(y, op_str, kwargs_)
         else:
-            result = self.__apply_public_op(y, op_str, kwargs_)
+            y_integral = (
+                MPCTensor._get_integral_share(y, self.session) if is_mul_op else None
+            )
+            if y_integral is not None:
+                # The integral value is not encoded, such that the result already
+                # has the right precision and there is no need for a division
+                result = self.__apply_public_op(y_integral, op_str, kwargs_)
+                rescale = False
+            else:
+                result = self.__apply_public_op(y, op_str, kwargs_)
 
         if isinstance(y, (float, int)):
             y_shape = (1,)
@@ -662,15 +1122,9 @@ class MPCTensor(metaclass=SyMPCTensor):
 
         result.shape = MPCTensor._get_shape(op_str, self.shape, y_shape, **kwargs_)
 
-        if op_str in {"mul", "matmul", "conv2d"} and not (
-            is_private and self.session.nr_parties == 2
-        ):
+        if rescale and not (is_private and self.session.nr_parties == 2):
             # For private op we do the division in the mul_parties function from spdz
-            scale = (
-                self.session.config.encoder_base
-                ** self.session.config.encoder_precision
-            )
-            result = result.div(scale)
+            result = result.div(self.session.encoder_scale)
 
         return result
 
@@ -695,13 +1149,6 @@ class MPCTensor(metaclass=SyMPCTensor):
         """
         return self.__str__()
 
-    @staticmethod
-    def __check_or_convert(value, session) -> "MPCTensor":
-        if not isinstance(value, MPCTensor):
-            return MPCTensor(secret=value, session=session)
-        else:
-            return value
-
     @staticmethod
     def hook_property(property_name: str) -> Any:
         """Hook a framework property (only getter).
@@ -726,7 +1173,11 @@ class MPCTensor(metaclass=SyMPCTensor):
                 prop = getattr(share, property_name)
                 shares.append(prop)
 
-            new_shape = getattr(torch.empty(_self.shape), property_name).shape
+            shape_fn = _SHAPE_FNS.get(property_name)
+            if shape_fn is not None:
+                new_shape = shape_fn(_self.shape)
+            else:
+                new_shape = getattr(torch.empty(_self.shape), property_name).shape
             res = MPCTensor(shares=shares, shape=new_shape, session=_self.session)
             return res
 
@@ -767,7 +1218,13 @@ class MPCTensor(metaclass=SyMPCTensor):
                 method = getattr(share, method_name)
                 shares.append(method(*args, **kwargs))
 
-            new_shape = getattr(torch.empty(_self.shape), method_name).shape
+            shape_fn = _SHAPE_FNS.get(method_name)
+            if shape_fn is not None and not kwargs:
+                new_shape = shape_fn(_self.shape, *args)
+            else:
+                new_shape = getattr(torch.empty(_self.shape), method_name)(
+                    *args, **kwargs
+                ).shape
             res = MPCTensor(shares=shares, shape=new_shape, session=_self.session)
             return res
 
@@ -800,7 +1257,10 @@ class MPCTensor(metaclass=SyMPCTensor):
         """
         shares = [share.unsqueeze(*args, **kwargs) for share in self.share_ptrs]
         res = MPCTensor(shares=shares, session=self.session)
-        res.shape = torch.empty(self.shape).unsqueeze(*args, **kwargs).shape
+        if kwargs:
+            res.shape = torch.empty(self.shape).unsqueeze(*args, **kwargs).shape
+        else:
+            res.shape = _SHAPE_FNS["unsqueeze"](self.shape, *args)
         return res
 
     def view(self, *args, **kwargs) -> "MPCTensor":
@@ -818,96 +1278,88 @@ class MPCTensor(metaclass=SyMPCTensor):
         """
         shares = [share.view(*args, **kwargs) for share in self.share_ptrs]
         res = MPCTensor(shares=shares, session=self.session)
-        res.shape = torch.empty(self.shape).view(*args, **kwargs).shape
+        if kwargs:
+            res.shape = torch.empty(self.shape).view(*args, **kwargs).shape
+        else:
+            res.shape = _SHAPE_FNS["view"](self.shape, *args)
         return res
 
-    def le(self, other: "MPCTensor") -> "MPCTensor":
+    def le(self, other: Union["MPCTensor", torch.Tensor, float, int]) -> "MPCTensor":
         """Lower or than operator.
 
         Args:
-            other (MPCTensor): MPCTensor to compare.
+            other (Union["MPCTensor", torch.Tensor, float, int]): Value to compare.
 
         Returns:
             MPCTensor: Result of the comparison.
         """
-        protocol = self.session.get_protocol()
-        other = self.__check_or_convert(other, self.session)
+        protocol = self.session.protocol
         return protocol.le(self, other)
 
-    def ge(self, other: "MPCTensor") -> "MPCTensor":
+    def ge(self, other: Union["MPCTensor", torch.Tensor, float, int]) -> "MPCTensor":
         """Greater or equal operator.
 
         Args:
-            other (MPCTensor): MPCTensor to compare.
+            other (Union["MPCTensor", torch.Tensor, float, int]): Value to compare.
 
         Returns:
             MPCTensor: Result of the comparison.
         """
-        protocol = self.session.get_protocol()
-        other = self.__check_or_convert(other, self.session)
+        protocol = self.session.protocol
         return protocol.le(other, self)
 
-    def lt(self, other: "MPCTensor") -> "MPCTensor":
+    def lt(self, other: Union["MPCTensor", torch.Tensor, float, int]) -> "MPCTensor":
         """Lower than operator.
 
         Args:
-            other (MPCTensor): MPCTensor to compare.
+            other (Union["MPCTensor", torch.Tensor, float, int]): Value to compare.
 
         Returns:
             MPCTensor: Result of the comparison.
         """
-        protocol = self.session.get_protocol()
-        other = self.__check_or_convert(other, self.session)
-        fp_encoder = FixedPointEncoder(
-            base=self.session.config.encoder_base,
-            precision=self.session.config.encoder_precision,
-        )
-        one = fp_encoder.decode(1)
+        protocol = self.session.protocol
+        config = self.session.config
+        one = _fp_one(config.encoder_base, config.encoder_precision)
         return protocol.le(self + one, other)
 
-    def gt(self, other: "MPCTensor") -> "MPCTensor":
+    def gt(self, other: Union["MPCTensor", torch.Tensor, float, int]) -> "MPCTensor":
         """Greater than operator.
 
         Args:
-            other (MPCTensor): MPCTensor to compare.
+            other (Union["MPCTensor", torch.Tensor, float, int]): Value to compare.
 
         Returns:
             MPCTensor: Result of the comparison.
         """
-        protocol = self.session.get_protocol()
-        other = self.__check_or_convert(other, self.session)
-        fp_encoder = FixedPointEncoder(
-            base=self.session.config.encoder_base,
-            precision=self.session.config.encoder_precision,
-        )
-        one = fp_encoder.decode(1)
+        protocol = self.session.protocol
+        config = self.session.config
+        one = _fp_one(config.encoder_base, config.encoder_precision)
         r = other + one
         return protocol.le(r, self)
 
-    def eq(self, other: "MPCTensor") -> "MPCTensor":
+    def eq(self, other: Union["MPCTensor", torch.Tensor, float, int]) -> "MPCTensor":
         """Equal operator.
 
         Args:
-            other (MPCTensor): MPCTensor to compare.
+            other (Union["MPCTensor", torch.Tensor, float, int]): Value to compare.
 
         Returns:
             MPCTensor: Result of the comparison.
         """
-        protocol = self.session.get_protocol()
-        other = self.__check_or_convert(other, self.session)
+        protocol = self.session.protocol
         return protocol.eq(self, other)
 
-    def ne(self, other: "MPCTensor") -> "MPCTensor":
+    def ne(self, other: Union["MPCTensor", torch.Tensor, float, int]) -> "MPCTensor":
         """Not equal operator.
 
         Args:
-            other (MPCTensor): MPCTensor to compare.
+            other (Union["MPCTensor", torch.Tensor, float, int]): Value to compare.
 
         Returns:
             MPCTensor: Result of the comparison.
         """
-        other = self.__check_or_convert(other, self.session)
-        return 1 - self.eq(other)
+        protocol = self.session.protocol
+        return protocol.eq(self, other, invert=True)
 
     __add__ = add
     __radd__ = add
@@ -927,7 +1379,13 @@ class MPCTensor(metaclass=SyMPCTensor):
     __ne__ = ne
 
 
-PARTIES_TO_SESSION: Dict[Any, Session] = {}
+# The sessions are kept alive only by the tensors that use them, such that the
+# sessions for party sets not used anymore are freed. Once the last tensor of a
+# session is freed, share() over the same parties creates and sets up a new
+# session: it is sent again to all the parties and the primitives already
+# populated in the crypto store of the old session are lost. To avoid this keep
+# a reference to a tensor (or create the Session and pass it as "session")
+PARTIES_TO_SESSION: "WeakValueDictionary[frozenset, Session]" = WeakValueDictionary()
 
 
 def share(_self, **kwargs: Dict[Any, Any]) -> MPCTensor:  # noqa
@@ -937,21 +1395,24 @@ def share(_self, **kwargs: Dict[Any, Any]) -> MPCTensor:  # noqa
         raise ValueError("Parties or Session should be provided as a kwarg")
 
     if "session" not in kwargs:
-        parties = frozenset({client.id for client in kwargs["parties"]})
+        parties = kwargs.pop("parties")
 
-        if parties not in PARTIES_TO_SESSION:
+        # The order of the parties does not matter for finding the session
+        parties_key = frozenset(client.id for client in parties)
+        session = PARTIES_TO_SESSION.get(parties_key)
+
+        if session is None:
             from sympc.session import SessionManager
 
-            session = Session(kwargs["parties"])
-            PARTIES_TO_SESSION[parties] = session
+            # The session keeps its own list, such that it is not changed if the
+            # caller changes the parties afterwards
+            session = Session(list(parties))
+            PARTIES_TO_SESSION[parties_key] = session
             SessionManager.setup_mpc(session)
 
             for key, val in kwargs.items():
                 setattr(session, key, val)
-        else:
-            session = PARTIES_TO_SESSION[parties]
 
-        kwargs.pop("parties")
         kwargs["session"] = session
 
     return MPCTensor(secret=_self, **kwargs)
@@ -100,6 +100,38 @@ class ShareTensor(metaclass=SyMPCTensor):
             tensor_type = self.session.tensor_type
             self.tensor = self._encode(data).type(tensor_type)
 
+    @staticmethod
+    def from_tensor(
+        tensor: torch.Tensor,
+        session: Session,
+        fp_encoder: Optional[FixedPointEncoder] = None,
+    ) -> "ShareTensor":
+        """Create a ShareTensor that holds an already encoded tensor.
+
+        It skips the initializer, such that there is no new FixedPointEncoder
+        created if one is given.
+
+        Args:
+            tensor (torch.Tensor): The (encoded) value of the share.
+            session (Session): The session from which this share belongs to.
+            fp_encoder (Optional[FixedPointEncoder]): The encoder for the share, it
+                should match the session config. If None a new one is created.
+
+        Returns:
+            ShareTensor: The share.
+        """
+        if fp_encoder is None:
+            fp_encoder = FixedPointEncoder(
+                base=session.config.encoder_base,
+                precision=session.config.encoder_precision,
+            )
+
+        share = ShareTensor.__new__(ShareTensor)
+        share.session = session
+        share.fp_encoder = fp_encoder
+        share.tensor = tensor
+        return share
+
     def _encode(self, data):
         return self.fp_encoder.encode(data)
 
@@ -153,8 +185,7 @@ class ShareTensor(metaclass=SyMPCTensor):
         else:
             value = op(self.tensor, y)
 
-        res = ShareTensor(session=self.session)
-        res.tensor = value
+        res = ShareTensor.from_tensor(value, self.session, self.fp_encoder)
         return res
 
     def add(self, y: Union[int, float, torch.Tensor, "ShareTensor"]) -> "ShareTensor":
@@ -266,7 +297,17 @@ class ShareTensor(metaclass=SyMPCTensor):
             ShareTensor. Result of the operation.
         """
         y = ShareTensor.sanity_checks(self, y, "matmul")
-        return y.matmul(self)
+
+        # The result belongs to this share - "y" might be an (unencoded) value sent
+        # by the orchestrator that does not hold the session of this party
+        value = operator.matmul(y.tensor, self.tensor)
+        res = ShareTensor.from_tensor(value, self.session, self.fp_encoder)
+
+        if self.session.nr_parties == 0:
+            # We are using a simple share without usig the MPCTensor
+            res.tensor = res.tensor // self.fp_encoder.scale
+
+        return res
 
     def div(self, y: Union[int, float, torch.Tensor, "ShareTensor"]) -> "ShareTensor":
         """Apply the "div" operation between "self" and "y".
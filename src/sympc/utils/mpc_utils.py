@@ -32,17 +32,20 @@ def count_wraps(share_list: List[torch.tensor]) -> torch.Tensor:
         torch.Tensor: The number of wraparounds.
     """
     res = torch.zeros(size=share_list[0].size(), dtype=torch.long)
+    # Shifting the sign bit to all the bits gives -1 where it is set and 0 otherwise
+    sign_shift = torch.iinfo(share_list[0].dtype).bits - 1
+
     prev_share = share_list[0]
     for cur_share in share_list[1:]:
         next_share = cur_share + prev_share
 
         # If prev and current shares are negative,
         # but the result is positive then is an underflow
-        res -= ((prev_share < 0) & (cur_share < 0) & (next_share > 0)).long()
+        res += (prev_share & cur_share & ~next_share) >> sign_shift
 
         # If prev and current shares are positive,
-        # but the result is positive then is an overflow
-        res += ((prev_share > 0) & (cur_share > 0) & (next_share < 0)).long()
+        # but the result is negative then is an overflow
+        res -= (~(prev_share | cur_share) & next_share) >> sign_shift
         prev_share = next_share
 
     return res
@@ -120,26 +123,27 @@ def decompose(
 ) -> torch.Tensor:
     """Decompose a tenstor into its binary representation.
 
+    The values are decomposed as elements of the ring: a negative value gives the
+    bits of its two's complement representation (all the bits are 0 or 1 and the
+    most significant one is the sign bit), such that sum(bit_i * 2**i) is equal to
+    the value modulo ring_size.
+
     Args:
         tensor (torch.Tensor): Tensor to decompose.
         ring_size (int): Ring size.
-        shape (Union[tuple, torch.Size]): Shape.
+        shape (Union[tuple, torch.Size]): Shape. Not needed, the bit positions
+            are broadcast against the tensor.
 
     Returns:
-        torch.Tensor: Tensor in binary.
+        torch.Tensor: Tensor in binary, the bits are on the last dimension
+        starting from the least significant one.
     """
     tensor_type = get_type_from_ring(ring_size)
 
     nr_bits = get_nr_bits(ring_size)
-    powers = torch.arange(nr_bits, dtype=tensor_type)
-
-    if shape is None:
-        shape = tensor.shape
-
-    for _ in range(len(shape)):
-        powers = powers.unsqueeze(0)
+    powers = torch.arange(nr_bits, dtype=tensor_type, device=tensor.device)
 
-    tensor = tensor.unsqueeze(-1)
-    moduli = (2 ** powers).to(tensor_type)
-    tensor = torch.fmod(tensor / moduli, 2).to(tensor_type)
-    return tensor
+    # Shift each bit in the first position and mask the others - this is exact
+    # for every bit, also for the sign bit of the negative values
+    tensor = tensor.type(tensor_type).unsqueeze(-1)
+    return (tensor >> powers) & 1
@@ -7,14 +7,21 @@ from concurrent.futures import ThreadPoolExecutor
 import functools
 from itertools import repeat
 import operator
+import threading
 from typing import Any
 from typing import Callable
 from typing import Dict
 from typing import List
 from typing import Optional
+from typing import Tuple
 from typing import Type
 from typing import Union
 
+# Thread pools reused by parallel_execution, for a number of workers and an event loop
+_THREAD_POOLS: Dict[Tuple[int, Any], ThreadPoolExecutor] = {}
+_THREAD_POOLS_LOCK = threading.Lock()
+_THREAD_POOL_PREFIX = "sympc_parallel"
+
 
 def ispointer(obj: Any) -> bool:
     """Check if a given obj is a pointer (is a remote object).
@@ -43,6 +50,45 @@ def islocal(obj: Any) -> bool:
     return party_type in {"VirtualMachineClient", "DomainClient"}
 
 
+def _set_event_loop(event_loop) -> None:
+    """Set the same event loop to other threads/processes.
+
+    This is needed because there are new threads/processes started with
+    the Executor and they do not have have an event loop set
+
+    Args:
+        event_loop: The event loop.
+    """
+    asyncio.set_event_loop(event_loop)
+
+
+def _get_thread_pool(max_workers: int, event_loop: Any) -> ThreadPoolExecutor:
+    """Get the thread pool for a number of workers, it is created only once.
+
+    Args:
+        max_workers (int): Number of threads in the pool.
+        event_loop (Any): The event loop set in the threads of the pool.
+
+    Returns:
+        ThreadPoolExecutor: The thread pool.
+    """
+    key = (max_workers, event_loop)
+    pool = _THREAD_POOLS.get(key)
+    if pool is None:
+        with _THREAD_POOLS_LOCK:
+            pool = _THREAD_POOLS.get(key)
+            if pool is None:
+                pool = ThreadPoolExecutor(
+                    max_workers=max_workers,
+                    thread_name_prefix=_THREAD_POOL_PREFIX,
+                    initializer=_set_event_loop,
+                    initargs=(event_loop,),
+                )
+                _THREAD_POOLS[key] = pool
+
+    return pool
+
+
 def parallel_execution(
     fn: Callable[..., Any],
     parties: Union[None, List[Any]] = None,
@@ -63,17 +109,6 @@ def parallel_execution(
         Callable[..., List[Any]]: A Callable that returns a list of results.
     """
 
-    def initializer(event_loop) -> None:
-        """Set the same event loop to other threads/processes.
-
-        This is needed because there are new threads/processes started with
-        the Executor and they do not have have an event loop set
-
-        Args:
-            event_loop: The event loop.
-        """
-        asyncio.set_event_loop(event_loop)
-
     @functools.wraps(fn)
     def wrapper(
         args: List[List[Any]],
@@ -113,13 +148,23 @@ def parallel_execution(
         futures = []
         loop = asyncio.get_event_loop()
 
-        with Executor(
-            max_workers=nr_parties, initializer=initializer, initargs=(loop,)
-        ) as executor:
+        # A function that runs in a pool thread and waits for other functions in
+        # the same pool could block forever, those get a new Executor
+        nested = threading.current_thread().name.startswith(_THREAD_POOL_PREFIX)
+
+        if cpu_bound or nested:
+            with Executor(
+                max_workers=nr_parties, initializer=_set_event_loop, initargs=(loop,)
+            ) as executor:
+                for i in range(nr_parties):
+                    _args = args[i]
+                    _kwargs = kwargs
+                    futures.append(executor.submit(funcs[i], *_args, **_kwargs))
+        else:
+            # Starting the threads for each call is slow compared to the ops
+            executor = _get_thread_pool(nr_parties, loop)
             for i in range(nr_parties):
-                _args = args[i]
-                _kwargs = kwargs
-                futures.append(executor.submit(funcs[i], *_args, **_kwargs))
+                futures.append(executor.submit(funcs[i], *args[i], **kwargs))
 
         local_shares = [f.result() for f in futures]
 
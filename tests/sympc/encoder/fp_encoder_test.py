@@ -60,6 +60,15 @@ def test_fp_decoding():
     assert (decoded_int == target_int).all()
 
 
+def test_fp_decoding_fractional():
+    """Test decoding negative and fractional values with FixedPointEncoder."""
+    fp_encoder = FixedPointEncoder()
+    tensor = torch.Tensor([-4.25, -0.5, 0.125, 3.75, -2])
+    decoded = fp_encoder.decode(fp_encoder.encode(tensor))
+    assert decoded.dtype == torch.float32
+    assert torch.equal(decoded, tensor)
+
+
 def test_fp_precision_setter():
     """Test the precision setter for the FixedPointEncoder."""
     fp_encoder = FixedPointEncoder()
@@ -32,6 +32,7 @@ def test_session_init():
     assert session.ring_size == 2 ** 64
     assert session.min_value == -(2 ** 64) // 2
     assert session.max_value == (2 ** 64 - 1) // 2
+    assert session.encoder_scale == 2 ** 16
     # Test custom init
     uuid = uuid4()
     config = Config()
@@ -53,6 +54,15 @@ def test_session_init():
     assert session.max_value == (2 ** 32 - 1) // 2
 
 
+def test_session_encoder_scale(get_clients):
+    session = Session(parties=get_clients(2))
+    session.config.encoder_base = 3
+    session.config.encoder_precision = 4
+    SessionManager.setup_mpc(session)
+
+    assert session.encoder_scale == 3 ** 4
+
+
 def test_przs_generate_random_share(get_clients):
     """Test przs_generate_random_share method from Session."""
     session = Session()
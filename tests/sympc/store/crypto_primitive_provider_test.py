@@ -1,5 +1,6 @@
 # stdlib
 import json
+import pickle
 from typing import Any
 from typing import Callable
 from typing import Dict
@@ -15,10 +16,12 @@ import torch
 from sympc.session import Session
 from sympc.session import SessionManager
 from sympc.store import CryptoPrimitiveProvider
+from sympc.store import crypto_primitive_provider
 from sympc.store import register_primitive_generator
 from sympc.store import register_primitive_store_add
 from sympc.store import register_primitive_store_get
 from sympc.tensor import MPCTensor
+from sympc.utils import get_type_from_ring
 
 PRIMITIVE_NR_ELEMS = 4
 
@@ -51,6 +54,11 @@ def provider_test(nr_parties: int, nr_instances: int) -> List[Tuple[int]]:
     return primitives
 
 
+@register_primitive_generator("test_prefetch_error")
+def provider_test_prefetch_error(nr_parties: int) -> List[Tuple[int]]:
+    raise RuntimeError("Could not generate the primitives")
+
+
 @register_primitive_store_get("test")
 def provider_test_get(
     store: Dict[str, List[Any]], nr_instances: int
@@ -100,6 +108,17 @@ def test_register_primitive() -> None:
     assert expected_providers in val, "Test Provider not registered"
 
 
+def test_get_state_after_register() -> None:
+    CryptoPrimitiveProvider.get_state()
+
+    @register_primitive_generator("test_state")
+    def provider_test_state() -> List[Any]:
+        return []
+
+    val = CryptoPrimitiveProvider.get_state()
+    assert "test_state" in val, "State not updated after register"
+
+
 @pytest.mark.parametrize("nr_instances", [1, 5, 100])
 @pytest.mark.parametrize("nr_parties", [2, 3, 4])
 def test_generate_primitive(
@@ -125,6 +144,159 @@ def test_generate_primitive(
             assert primitive == tuple(i for _ in range(PRIMITIVE_NR_ELEMS))
 
 
+def test_generate_primitive_reuse(get_clients: Callable) -> None:
+    parties = get_clients(2)
+    session = Session(parties=parties)
+    SessionManager.setup_mpc(session)
+
+    g_kwargs = {"nr_parties": 2, "nr_instances": 3}
+    res = [
+        CryptoPrimitiveProvider.generate_primitives(
+            "test",
+            sessions=session.session_ptrs,
+            g_kwargs=g_kwargs,
+            p_kwargs=None,
+            reuse=reuse,
+        )
+        for reuse in [True, True, False]
+    ]
+
+    assert res[0] is res[1]
+    assert res[0] is not res[2]
+    assert res[0] == res[2]
+
+
+def test_random_tensor() -> None:
+    rand_a = CryptoPrimitiveProvider.random_tensor((10, 10))
+    rand_b = CryptoPrimitiveProvider.random_tensor((10, 10))
+
+    assert rand_a.shape == (10, 10)
+    assert rand_a.dtype == torch.long
+    assert not torch.equal(rand_a, rand_b)
+
+
+def test_freeze(monkeypatch) -> None:
+    # Freezing is permanent - restore the registry after the test
+    monkeypatch.setattr(crypto_primitive_provider, "_FUNC_PROVIDERS", {})
+    monkeypatch.setattr(CryptoPrimitiveProvider, "_func_providers", {})
+    crypto_primitive_provider._FUNC_PROVIDERS["test"] = provider_test
+    CryptoPrimitiveProvider._func_providers["test"] = provider_test
+
+    CryptoPrimitiveProvider.freeze()
+
+    res = CryptoPrimitiveProvider.generate_primitives_offline(
+        "test", nr_parties=2, nr_instances=1
+    )
+    assert len(res) == 2
+
+    with pytest.raises(TypeError):
+
+        @register_primitive_generator("test_frozen")
+        def provider_test_frozen() -> List[Any]:
+            return []
+
+
+@pytest.mark.parametrize("nr_parties", [2, 3])
+def test_generate_primitive_offline(nr_parties: int) -> None:
+    res = CryptoPrimitiveProvider.generate_primitives_offline(
+        "test", nr_parties=nr_parties, nr_instances=2
+    )
+
+    assert len(res) == nr_parties
+    for i, primitives in enumerate(res):
+        for primitive in primitives:
+            assert primitive == tuple(i for _ in range(PRIMITIVE_NR_ELEMS))
+
+
+@pytest.mark.parametrize("ring_size", [2 ** 32, 2 ** 64])
+def test_generate_primitive_offline_beaver_ring(ring_size: int) -> None:
+    res = CryptoPrimitiveProvider.generate_primitives_offline(
+        "beaver_mul", nr_parties=2, a_shape=(2, 3), b_shape=(2, 3), ring_size=ring_size
+    )
+
+    tensor_type = get_type_from_ring(ring_size)
+    # Reconstruct the triple of the first instance
+    a, b, c = (res[0][0][i].tensor + res[1][0][i].tensor for i in range(3))
+
+    assert a.dtype == b.dtype == c.dtype == tensor_type
+    assert torch.equal(a * b, c)
+
+
+def test_generate_primitive_prefetch() -> None:
+    g_kwargs = {"nr_parties": 2, "a_shape": (2, 3), "b_shape": (2, 3)}
+    CryptoPrimitiveProvider.start_prefetch("beaver_mul", g_kwargs=g_kwargs, size=2)
+
+    try:
+        prefetcher = crypto_primitive_provider._PREFETCHERS[
+            CryptoPrimitiveProvider._get_primitives_key("beaver_mul", g_kwargs)
+        ]
+        res = [
+            CryptoPrimitiveProvider.generate_primitives_offline(
+                "beaver_mul", **g_kwargs
+            )
+            for _ in range(3)
+        ]
+    finally:
+        CryptoPrimitiveProvider.stop_prefetch()
+
+    assert not prefetcher.thread.is_alive()
+    assert not crypto_primitive_provider._PREFETCHERS
+
+    for primitives in res:
+        a, b, c = (
+            primitives[0][0][i].tensor + primitives[1][0][i].tensor for i in range(3)
+        )
+        assert torch.equal(a * b, c)
+
+    # Each prefetched triple is used only once
+    assert not torch.equal(res[0][0][0][0].tensor, res[1][0][0][0].tensor)
+
+
+def test_generate_primitive_prefetch_generator_exception() -> None:
+    CryptoPrimitiveProvider.start_prefetch(
+        "test_prefetch_error", g_kwargs={"nr_parties": 2}, size=1
+    )
+
+    try:
+        # The error is raised for each call instead of waiting forever
+        for _ in range(2):
+            with pytest.raises(RuntimeError):
+                CryptoPrimitiveProvider.generate_primitives_offline(
+                    "test_prefetch_error", nr_parties=2
+                )
+    finally:
+        CryptoPrimitiveProvider.stop_prefetch()
+
+
+def test_generate_primitive_prefetch_exception() -> None:
+    with pytest.raises(ValueError):
+        CryptoPrimitiveProvider.start_prefetch("not_registered")
+
+
+def test_generate_primitive_offline_exception() -> None:
+    with pytest.raises(ValueError):
+        CryptoPrimitiveProvider.generate_primitives_offline("not_registered")
+
+
+@pytest.mark.parametrize("n_ops", [2, 5])
+def test_generate_primitive_n_ops(get_clients: Callable, n_ops: int) -> None:
+    parties = get_clients(2)
+    session = Session(parties=parties)
+    SessionManager.setup_mpc(session)
+
+    res = CryptoPrimitiveProvider.generate_primitives(
+        "test",
+        sessions=session.session_ptrs,
+        g_kwargs={"nr_parties": 2},
+        p_kwargs=None,
+        n_ops=n_ops,
+    )
+
+    assert len(res) == 2
+    for primitives in res:
+        assert len(primitives) == n_ops
+
+
 @pytest.mark.parametrize(
     ("nr_instances", "nr_instances_retrieve"),
     [(1, 1), (5, 4), (5, 5), (100, 25), (100, 100)],
@@ -159,7 +331,10 @@ def test_generate_and_transfer_primitive(
         ]
 
 
-def test_primitive_logging_model(get_clients) -> None:
+def test_primitive_logging_model(get_clients, monkeypatch) -> None:
+    # The expected log is in the json module format
+    monkeypatch.setattr(crypto_primitive_provider, "orjson", None)
+
     model = LinearNet(torch)
 
     clients = get_clients(2)
@@ -197,7 +372,10 @@ def test_primitive_logging_model(get_clients) -> None:
         ["fss_comp", {}],
     ],
 )
-def test_primitive_logging_ops(ops, get_clients) -> None:
+def test_primitive_logging_ops(ops, get_clients, monkeypatch) -> None:
+    # The expected log is in the json module format
+    monkeypatch.setattr(crypto_primitive_provider, "orjson", None)
+
     clients = get_clients(2)
     session = Session(parties=clients)
     SessionManager.setup_mpc(session)
@@ -228,3 +406,105 @@ def test_primitive_logging_ops(ops, get_clients) -> None:
     expected_log = json.dumps({ops[0]: [ops[1]]})
 
     assert expected_log == primitive_log
+
+
+def test_dumps_json(monkeypatch) -> None:
+    monkeypatch.setattr(crypto_primitive_provider, "orjson", None)
+    ops = {"beaver_mul": [{"a_shape": [2, 3], "b_shape": [2, 3]}], "fss_comp": [{}]}
+
+    assert crypto_primitive_provider._dumps(ops) == json.dumps(ops)
+
+
+def test_dumps_orjson(monkeypatch) -> None:
+    orjson = pytest.importorskip("orjson")
+    monkeypatch.setattr(crypto_primitive_provider, "orjson", orjson)
+    ops = {"beaver_mul": [{"a_shape": torch.Size([2, 3]), "b_shape": (2, 3)}]}
+
+    # orjson writes the compact form, the shapes are written as lists
+    expected_log = '{"beaver_mul":[{"a_shape":[2,3],"b_shape":[2,3]}]}'
+    assert crypto_primitive_provider._dumps(ops) == expected_log
+
+
+def test_primitive_logging_stream(get_clients, tmp_path, monkeypatch) -> None:
+    monkeypatch.chdir(tmp_path)
+
+    clients = get_clients(2)
+    session = Session(parties=clients)
+    SessionManager.setup_mpc(session)
+
+    CryptoPrimitiveProvider.start_logging(stream=True)
+    for _ in range(2):
+        CryptoPrimitiveProvider.generate_primitives(
+            sessions=session.session_ptrs,
+            op_str="fss_comp",
+            p_kwargs={},
+            g_kwargs={"n_values": 4},
+        )
+    filename = CryptoPrimitiveProvider.stop_logging()
+
+    with open(filename) as f:
+        primitive_log = [json.loads(line) for line in f]
+
+    assert primitive_log == [{"op_str": "fss_comp", "p_kwargs": {}}] * 2
+
+
+def test_primitive_logging_stream_restart(tmp_path, monkeypatch) -> None:
+    monkeypatch.chdir(tmp_path)
+
+    CryptoPrimitiveProvider.start_logging(stream=True)
+    log_file = CryptoPrimitiveProvider._log_file
+    CryptoPrimitiveProvider.start_logging(stream=True)
+
+    # The file opened by the first call is not leaked
+    assert log_file.closed
+
+    CryptoPrimitiveProvider.generate_primitives_offline("fss_comp", n_values=4)
+    filename = CryptoPrimitiveProvider.stop_logging(fmt="file")
+
+    assert CryptoPrimitiveProvider._log_file is None
+    with open(filename) as f:
+        primitive_log = [json.loads(line) for line in f]
+
+    assert primitive_log == [{"op_str": "fss_comp", "p_kwargs": None}]
+
+
+@pytest.mark.parametrize(
+    "kwargs", [{"fmt": "json"}, {"fmt": "dict"}, {"generate_file": True}]
+)
+def test_primitive_logging_stream_exception(tmp_path, monkeypatch, kwargs) -> None:
+    monkeypatch.chdir(tmp_path)
+
+    CryptoPrimitiveProvider.start_logging(stream=True)
+
+    with pytest.raises(ValueError):
+        CryptoPrimitiveProvider.stop_logging(**kwargs)
+
+    # The logging is not stopped by the failed call
+    assert CryptoPrimitiveProvider._LOGGING
+    assert CryptoPrimitiveProvider.stop_logging() == "primitive_log.jsonl"
+
+
+@pytest.mark.parametrize("fmt", ["dict", "pickle"])
+def test_primitive_logging_fmt(get_clients, fmt) -> None:
+    clients = get_clients(2)
+    session = Session(parties=clients)
+    SessionManager.setup_mpc(session)
+
+    CryptoPrimitiveProvider.start_logging()
+    CryptoPrimitiveProvider.generate_primitives(
+        sessions=session.session_ptrs,
+        op_str="fss_comp",
+        p_kwargs={},
+        g_kwargs={"n_values": 4},
+    )
+    primitive_log = CryptoPrimitiveProvider.stop_logging(fmt=fmt)
+
+    if fmt == "pickle":
+        primitive_log = pickle.loads(primitive_log)
+
+    assert primitive_log == {"fss_comp": [{}]}
+
+
+def test_primitive_logging_fmt_exception() -> None:
+    with pytest.raises(ValueError):
+        CryptoPrimitiveProvider.stop_logging(fmt="xml")
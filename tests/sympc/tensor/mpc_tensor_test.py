@@ -1,5 +1,7 @@
 # stdlib
+import gc
 import operator
+from types import SimpleNamespace
 
 # third party
 import numpy as np
@@ -10,6 +12,8 @@ from sympc.session import Session
 from sympc.session import SessionManager
 from sympc.tensor import MPCTensor
 from sympc.tensor import ShareTensor
+from sympc.tensor import mpc_tensor as mpc_tensor_module
+from sympc.tensor.mpc_tensor import PARTIES_TO_SESSION
 
 
 def test_mpc_tensor_exception(get_clients) -> None:
@@ -43,6 +47,49 @@ def test_reconstruct(get_clients) -> None:
     assert np.allclose(x_secret, x)
 
 
+def test_get_local_shares(get_clients) -> None:
+    clients = get_clients(3)
+    session = Session(parties=clients)
+    SessionManager.setup_mpc(session)
+
+    x = MPCTensor(secret=torch.Tensor([1, -2]), session=session)
+    y = MPCTensor(secret=torch.Tensor([3, 4, 5]), session=session)
+
+    local_shares = MPCTensor.get_local_shares([*x.share_ptrs, *y.share_ptrs])
+
+    assert len(local_shares) == 6
+    assert (sum(local_shares[:3]).tensor == x.reconstruct(decode=False)).all()
+    assert (sum(local_shares[3:]).tensor == y.reconstruct(decode=False)).all()
+
+
+def test_get_local_shares_domain_parallel(monkeypatch) -> None:
+    class _DomainShare:
+        client = SimpleNamespace(class_name="DomainClient")
+
+        def __init__(self, value: int) -> None:
+            self.value = value
+
+        def get_copy(self) -> int:
+            return self.value
+
+    parallel_calls = []
+
+    def _parallel_execution(fn, *args, **kwargs):
+        def _wrapper(args_fn):
+            parallel_calls.append(len(args_fn))
+            return [fn(*arg) for arg in args_fn]
+
+        return _wrapper
+
+    monkeypatch.setattr(mpc_tensor_module, "parallel_execution", _parallel_execution)
+
+    local_shares = MPCTensor.get_local_shares([_DomainShare(i) for i in range(4)])
+
+    # The copies from Domains are network requests - they are sent together
+    assert local_shares == [0, 1, 2, 3]
+    assert parallel_calls == [4]
+
+
 def test_op_mpc_different_sessions(get_clients) -> None:
     clients = get_clients(2)
     session_one = Session(parties=clients)
@@ -157,6 +204,30 @@ def test_conv2d_mpc_mpc(get_clients, nr_clients, bias, stride, padding) -> None:
     assert np.allclose(result, expected_result, rtol=10e-4)
 
 
+@pytest.mark.parametrize("nr_clients", [2, 3])
+@pytest.mark.parametrize("private_bias", [True, False])
+def test_linear(get_clients, nr_clients, private_bias) -> None:
+    clients = get_clients(nr_clients)
+    session = Session(parties=clients)
+    SessionManager.setup_mpc(session)
+
+    x_secret = torch.Tensor([[0.125, -1.25, 2], [-4.25, 4, 0.5]])
+    weight_secret = torch.Tensor([[1.5, -2], [0.25, 3], [-1, 0.75]])
+    bias_secret = torch.Tensor([0.5, -1.5])
+
+    x = MPCTensor(secret=x_secret, session=session)
+    weight = MPCTensor(secret=weight_secret, session=session)
+    bias = (
+        MPCTensor(secret=bias_secret, session=session) if private_bias else bias_secret
+    )
+
+    result = x.linear(weight, bias)
+    expected_result = x_secret @ weight_secret + bias_secret
+
+    assert result.shape == expected_result.shape
+    assert np.allclose(result.reconstruct(), expected_result, atol=10e-4)
+
+
 @pytest.mark.parametrize("nr_clients", [2, 3, 4, 5])
 @pytest.mark.parametrize("op_str", ["mul", "matmul", "truediv"])
 def test_ops_mpc_public(get_clients, nr_clients, op_str) -> None:
@@ -178,6 +249,64 @@ def test_ops_mpc_public(get_clients, nr_clients, op_str) -> None:
     assert np.allclose(result, expected_result, atol=10e-4)
 
 
+@pytest.mark.parametrize("nr_clients", [2, 3])
+@pytest.mark.parametrize("op_str", ["add", "sub"])
+@pytest.mark.parametrize("y_secret", [2.5, 3, torch.Tensor([1.5, -2])])
+def test_ops_mpc_public_local(get_clients, nr_clients, op_str, y_secret) -> None:
+    clients = get_clients(nr_clients)
+    session = Session(parties=clients)
+    SessionManager.setup_mpc(session)
+
+    x_secret = torch.Tensor([0.125, -1.25])
+    x = MPCTensor(secret=x_secret, session=session)
+
+    op = getattr(operator, op_str)
+    result = op(x, y_secret)
+
+    # Only the first party adds the public value, the other shares are reused
+    assert all(
+        res_share is x_share
+        for res_share, x_share in zip(result.share_ptrs[1:], x.share_ptrs[1:])
+    )
+    assert np.allclose(result.reconstruct(), op(x_secret, y_secret), atol=10e-4)
+
+
+@pytest.mark.parametrize("nr_clients", [2, 3])
+@pytest.mark.parametrize("op_str", ["mul", "matmul"])
+def test_ops_mpc_public_integral(get_clients, nr_clients, op_str) -> None:
+    clients = get_clients(nr_clients)
+    session = Session(parties=clients)
+    SessionManager.setup_mpc(session)
+
+    x_secret = torch.Tensor([[0.125, -1.25], [-4.25, 4]])
+    y_secret = torch.Tensor([[4, -2], [5, 3]])
+    x = MPCTensor(secret=x_secret, session=session)
+
+    op = getattr(operator, op_str)
+    expected_result = op(x_secret, y_secret)
+
+    # No division (and no truncation) is needed when multiplying with integers
+    result = op(x, y_secret).reconstruct()
+    assert torch.equal(result, expected_result)
+
+
+@pytest.mark.parametrize("nr_clients", [2, 3])
+def test_ops_public_mpc_integral_rmatmul(get_clients, nr_clients) -> None:
+    clients = get_clients(nr_clients)
+    session = Session(parties=clients)
+    SessionManager.setup_mpc(session)
+
+    x_secret = torch.Tensor([[0.125, -1.25], [-4.25, 4]])
+    y_secret = torch.Tensor([[4, -2], [5, 3]])
+    x = MPCTensor(secret=x_secret, session=session)
+
+    expected_result = y_secret @ x_secret
+
+    # No division (and no truncation) is needed when multiplying with integers
+    result = (y_secret @ x).reconstruct()
+    assert torch.equal(result, expected_result)
+
+
 @pytest.mark.parametrize("nr_clients", [2, 3, 4, 5])
 @pytest.mark.parametrize("op_str", ["add", "sub", "mul", "matmul"])
 def test_ops_public_mpc(get_clients, nr_clients, op_str) -> None:
@@ -261,6 +390,44 @@ def test_generate_shares() -> None:
     assert sum(shares_from_share_tensor).tensor == sum(shares_from_secret).tensor
 
 
+def test_generate_shares_reuse_buffer() -> None:
+    x_secret = torch.Tensor([[1.0, 2.0], [3.0, 4.0]])
+    y_secret = torch.Tensor([[5.0, 6.0], [7.0, 8.0]])
+
+    x_shares = MPCTensor.generate_shares(x_secret, 3, tensor_type=torch.long)
+    x_sum = sum(share.tensor for share in x_shares)
+
+    # The buffer used for x is reused for y, the shares of x should not change
+    y_shares = MPCTensor.generate_shares(y_secret, 3, tensor_type=torch.long)
+
+    assert (sum(share.tensor for share in x_shares) == x_sum).all()
+    assert (sum(y_shares).tensor == ShareTensor(data=y_secret).tensor).all()
+
+
+def test_random_buffer_not_shared() -> None:
+    size = (3, 5)
+
+    buffer = mpc_tensor_module._borrow_buffer(size, torch.long)
+    # A buffer is not handed out again while it is held
+    other_buffer = mpc_tensor_module._borrow_buffer(size, torch.long)
+    assert other_buffer is not buffer
+
+    mpc_tensor_module._return_buffer(buffer)
+    reused_buffer = mpc_tensor_module._borrow_buffer(size, torch.long)
+    assert reused_buffer is buffer
+    assert mpc_tensor_module._borrow_buffer(size, torch.long) is not reused_buffer
+
+
+def test_random_buffer_large_not_pooled() -> None:
+    size = (mpc_tensor_module._RANDOM_BUF_MAX_BYTES // 8 + 1,)
+
+    buffer = mpc_tensor_module._borrow_buffer(size, torch.long)
+    mpc_tensor_module._return_buffer(buffer)
+
+    assert (size, torch.long) not in mpc_tensor_module._RANDOM_BUF_POOL
+    assert mpc_tensor_module._borrow_buffer(size, torch.long) is not buffer
+
+
 def test_generate_shares_session(get_clients) -> None:
     clients = get_clients(2)
     session = Session(parties=clients)
@@ -313,6 +480,31 @@ def test_equality_mpc_mpc(get_clients, protocol, op_str) -> None:
     assert (result == expected_result).all()
 
 
+@pytest.mark.parametrize("protocol", ["FSS"])
+@pytest.mark.parametrize("op_str", ["le", "lt", "ge", "gt", "eq", "ne"])
+def test_comp_mpc_mpc_broadcast(get_clients, protocol, op_str) -> None:
+    clients = get_clients(2)
+    session = Session(parties=clients, protocol=protocol)
+    SessionManager.setup_mpc(session)
+
+    op = getattr(operator, op_str)
+
+    x_secret = torch.Tensor([[0.125, -2.5], [-4.25, 2.25]])
+    y_secret = torch.Tensor([2.25])
+    x = MPCTensor(secret=x_secret, session=session)
+    y = MPCTensor(secret=y_secret, session=session)
+
+    for x_op, y_op, x_sec, y_sec in [
+        (x, y, x_secret, y_secret),
+        (y, x, y_secret, x_secret),
+    ]:
+        result = op(x_op, y_op)
+        expected_result = op(x_sec, y_sec)
+
+        assert result.shape == expected_result.shape
+        assert (result.reconstruct() == expected_result).all()
+
+
 @pytest.mark.parametrize("protocol", ["FSS"])
 @pytest.mark.parametrize("op_str", ["le", "lt", "ge", "gt", "eq", "ne"])
 def test_comp_mpc_public(get_clients, protocol, op_str) -> None:
@@ -349,6 +541,25 @@ def test_comp_public_mpc(get_clients, protocol, op_str) -> None:
     assert (result == expected_result).all()
 
 
+@pytest.mark.parametrize("protocol", ["FSS"])
+@pytest.mark.parametrize("op_str", ["le", "lt", "ge", "gt", "eq", "ne"])
+def test_comp_mpc_public_broadcast(get_clients, protocol, op_str) -> None:
+    clients = get_clients(2)
+    session = Session(parties=clients, protocol=protocol)
+    SessionManager.setup_mpc(session)
+
+    op = getattr(operator, op_str)
+
+    x_secret = torch.Tensor([0.5])
+    y_secret = torch.Tensor([-1.25, 0.5, 3])
+    x = MPCTensor(secret=x_secret, session=session)
+    result = op(x, y_secret)
+    expected_result = op(x_secret, y_secret)
+
+    assert result.shape == expected_result.shape
+    assert (result.reconstruct() == expected_result).all()
+
+
 def test_share_get_method_parties(get_clients) -> None:
     clients = get_clients(2)
 
@@ -374,6 +585,91 @@ def test_share_get_method_parties_exception(get_clients) -> None:
         res = mpc_tensor1 * mpc_tensor2
 
 
+def test_share_get_method_parties_same_list(get_clients) -> None:
+    clients = get_clients(2)
+
+    x_secret = torch.Tensor([1.0, 2.0, 5.0])
+
+    mpc_tensor1 = x_secret.share(parties=clients)
+    mpc_tensor2 = x_secret.share(parties=clients)
+
+    assert mpc_tensor1.session.parties == clients
+    assert mpc_tensor2.session is mpc_tensor1.session
+
+
+def test_share_get_method_parties_list_mutated(get_clients) -> None:
+    all_clients = get_clients(3)
+    clients = all_clients[:2]
+
+    x_secret = torch.Tensor([1.0, 2.0, 5.0])
+
+    mpc_tensor1 = x_secret.share(parties=clients)
+    clients.append(all_clients[2])
+    mpc_tensor2 = x_secret.share(parties=clients)
+
+    assert mpc_tensor1.session.nr_parties == len(mpc_tensor1.session.parties) == 2
+    assert mpc_tensor2.session is not mpc_tensor1.session
+    assert mpc_tensor2.session.nr_parties == 3
+    assert all(mpc_tensor2.reconstruct() == x_secret)
+
+
+def test_share_get_method_parties_container_state(get_clients) -> None:
+    class Parties(list):
+        pass
+
+    clients = Parties(get_clients(2))
+
+    x_secret = torch.Tensor([1.0, 2.0, 5.0])
+
+    mpc_tensor1 = x_secret.share(parties=clients)
+    mpc_tensor2 = x_secret.share(parties=list(reversed(clients)))
+
+    # No state is kept on the caller's container
+    assert not hasattr(clients, "_sympc_session")
+    assert mpc_tensor2.session is mpc_tensor1.session
+
+
+def test_share_get_method_parties_session_freed(get_clients, monkeypatch) -> None:
+    clients = get_clients(2)
+    parties_key = frozenset(client.id for client in clients)
+
+    nr_setups = 0
+    setup_mpc = SessionManager.setup_mpc
+
+    def _count_setup_mpc(session: Session) -> None:
+        nonlocal nr_setups
+        nr_setups += 1
+        setup_mpc(session)
+
+    monkeypatch.setattr(SessionManager, "setup_mpc", _count_setup_mpc)
+
+    # Free the sessions left by other tests for the same parties
+    gc.collect()
+
+    x_secret = torch.Tensor([1.0, 2.0, 5.0])
+    mpc_tensor = x_secret.share(parties=clients)
+    session_uuid = mpc_tensor.session.uuid
+
+    # While a tensor uses the session it is not set up again
+    mpc_tensor2 = x_secret.share(parties=clients)
+
+    assert PARTIES_TO_SESSION[parties_key] is mpc_tensor.session
+    assert mpc_tensor2.session is mpc_tensor.session
+    assert nr_setups == 1
+
+    del mpc_tensor, mpc_tensor2
+    gc.collect()
+
+    assert parties_key not in PARTIES_TO_SESSION
+
+    # The session was freed with its last tensor - a new one is set up
+    mpc_tensor = x_secret.share(parties=clients)
+
+    assert mpc_tensor.session.uuid != session_uuid
+    assert nr_setups == 2
+    assert all(mpc_tensor.reconstruct() == x_secret)
+
+
 def test_share_get_method_session(get_clients) -> None:
     clients = get_clients(2)
     session = Session(parties=clients)
@@ -388,7 +684,7 @@ def test_share_get_method_session(get_clients) -> None:
     assert all(res.get() == expected_res)
 
 
-@pytest.mark.parametrize("power", [4, 7])
+@pytest.mark.parametrize("power", [0, 1, 4, 7, 15, 17])
 def test_pow(get_clients, power) -> None:
     clients = get_clients(2)
     session = Session(parties=clients)
@@ -404,3 +700,102 @@ def test_pow(get_clients, power) -> None:
 
     with pytest.raises(RuntimeError):
         power = x ** -2
+
+
+@pytest.mark.parametrize(
+    ("op_str", "x_shape", "y_shape", "kwargs"),
+    [
+        ("add", (2, 1, 3), (4, 3), {}),
+        ("mul", (3,), (2, 3), {}),
+        ("matmul", (3,), (3,), {}),
+        ("matmul", (5, 2, 3), (3, 4), {}),
+        ("matmul", (2, 3), (3,), {}),
+        ("conv2d", (1, 1, 28, 28), (5, 1, 5, 5), {}),
+        (
+            "conv2d",
+            (2, 4, 10, 9),
+            (6, 2, 3, 3),
+            {"stride": 2, "padding": 1, "groups": 2},
+        ),
+    ],
+)
+def test_get_shape(op_str, x_shape, y_shape, kwargs) -> None:
+    x = torch.empty(size=x_shape)
+    y = torch.empty(size=y_shape)
+    op = torch.conv2d if op_str == "conv2d" else getattr(operator, op_str)
+
+    shape = MPCTensor._get_shape(op_str, x_shape, y_shape, **kwargs)
+
+    assert shape == op(x, y, **kwargs).shape
+
+
+def test_get_shape_exception() -> None:
+    with pytest.raises(ValueError):
+        MPCTensor._get_shape("matmul", (2, 3), (2, 3))
+
+
+@pytest.mark.parametrize(
+    ("x_shape", "y_shape", "kwargs"),
+    [
+        ((1, 28, 28), (5, 1, 5, 5), {}),
+        ((1, 1, 28, 28), (5, 1, 5), {}),
+        ((1, 4, 10, 10), (5, 2, 3, 3), {"groups": 2}),
+        ((1, 4, 10, 10), (6, 2, 3, 3), {"groups": 3}),
+        ((1, 4, 10, 10), (6, 4, 3, 3), {"groups": 0}),
+        ((1, 3, 10, 10), (6, 2, 3, 3), {}),
+        ((1, 1, 4, 4), (5, 1, 5, 5), {}),
+    ],
+)
+def test_get_shape_conv2d_exception(x_shape, y_shape, kwargs) -> None:
+    x = torch.empty(size=x_shape)
+    y = torch.empty(size=y_shape)
+
+    # The shape is not inferred for inputs torch rejects
+    with pytest.raises(RuntimeError):
+        torch.conv2d(x, y, **kwargs)
+
+    with pytest.raises(ValueError):
+        MPCTensor._get_shape("conv2d", x_shape, y_shape, **kwargs)
+
+
+@pytest.mark.parametrize(
+    ("method", "args"),
+    [("unsqueeze", (0,)), ("unsqueeze", (-1,)), ("view", (-1,)), ("view", (3, 2))],
+)
+def test_hook_method_shape(get_clients, method, args) -> None:
+    clients = get_clients(2)
+    session = Session(parties=clients)
+    SessionManager.setup_mpc(session)
+
+    x_secret = torch.Tensor([[1, 2, 3], [4, 5, 6]])
+    x = MPCTensor(secret=x_secret, session=session)
+
+    res = getattr(x, method)(*args)
+    expected = getattr(x_secret, method)(*args)
+
+    assert res.shape == expected.shape
+    assert torch.allclose(res.reconstruct(), expected)
+
+
+def test_hook_property_shape(get_clients) -> None:
+    clients = get_clients(2)
+    session = Session(parties=clients)
+    SessionManager.setup_mpc(session)
+
+    x_secret = torch.Tensor([[1, 2, 3], [4, 5, 6]])
+    x = MPCTensor(secret=x_secret, session=session)
+
+    assert x.T.shape == x_secret.T.shape
+    assert torch.allclose(x.T.reconstruct(), x_secret.T)
+
+
+def test_mpc_tensor_shape_canonical(get_clients) -> None:
+    clients = get_clients(2)
+    session = Session(parties=clients)
+    SessionManager.setup_mpc(session)
+
+    x = MPCTensor(secret=torch.Tensor([[1, 2], [3, 4]]), session=session)
+    y = MPCTensor(shares=x.share_ptrs, shape=[2, 2], session=session)
+
+    assert isinstance(y.shape, torch.Size)
+    assert y.shape == x.shape
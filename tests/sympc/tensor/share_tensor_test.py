@@ -172,3 +172,16 @@ def test_share_decode() -> None:
     x_share = ShareTensor(data=x)
 
     assert x == x_share.decode()
+
+
+def test_share_from_tensor() -> None:
+    x_share = ShareTensor(data=torch.Tensor([5.0, -2.5]))
+
+    share = ShareTensor.from_tensor(x_share.tensor, x_share.session)
+    assert share == x_share
+    assert torch.equal(share.decode(), x_share.decode())
+
+    share = ShareTensor.from_tensor(
+        x_share.tensor, x_share.session, fp_encoder=x_share.fp_encoder
+    )
+    assert share.fp_encoder is x_share.fp_encoder
@@ -0,0 +1,35 @@
+# third party
+import pytest
+import torch
+
+from sympc.utils import decompose
+from sympc.utils import get_type_from_ring
+
+
+@pytest.mark.parametrize("ring_size", [2 ** 32, 2 ** 64])
+@pytest.mark.parametrize("value", [0, 1, 5, 2 ** 30 + 3, -1, -6, -(2 ** 31)])
+def test_decompose(ring_size: int, value: int) -> None:
+    tensor_type = get_type_from_ring(ring_size)
+    nr_bits = (ring_size - 1).bit_length()
+
+    bits = decompose(torch.tensor([value], dtype=tensor_type), ring_size)
+
+    assert bits.shape == (1, nr_bits)
+    assert bits.dtype == tensor_type
+    assert set(bits.flatten().tolist()) <= {0, 1}
+
+    # The bits of the value in the ring - two's complement for negative values
+    expected = [(value % ring_size) >> i & 1 for i in range(nr_bits)]
+    assert bits[0].tolist() == expected
+
+
+def test_decompose_shape() -> None:
+    tensor = torch.tensor([[0, 3], [-2, 7]], dtype=torch.long)
+
+    bits = decompose(tensor, 2 ** 64)
+
+    assert bits.shape == (2, 2, 64)
+    assert bits[0, 0].tolist() == [0] * 64
+    assert bits[0, 1].tolist() == [1, 1] + [0] * 62
+    assert bits[1, 0].tolist() == [0] + [1] * 63
+    assert bits[1, 1].tolist() == [1, 1, 1] + [0] * 61